@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+from gpio_backend import get_gpio # [NEW] GPIO 백엔드 선택 (RPi.GPIO / libgpiod / 시뮬레이터)
 
 import time
 
@@ -114,6 +114,7 @@ ALARM_TIME = 0.1 # 짧고 다급한 간격
 
 # ==================== GPIO 초기화 ====================
 
+GPIO = get_gpio() # [NEW] DOORLOCK_GPIO_BACKEND 환경 변수로 백엔드 선택 (기본: auto)
 GPIO.setmode(GPIO.BCM)
 
 GPIO.setwarnings(False)
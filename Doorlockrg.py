@@ -1,10 +1,23 @@
-import RPi.GPIO as GPIO
-import time
-import threading # 부저와 LED/모터 동작을 동시에 처리하기 위해 threading 모듈 사용
+from gpio_backend import get_gpio # [NEW] GPIO 백엔드 선택 (RPi.GPIO / libgpiod / 시뮬레이터)
+import asyncio # [MODIFIED] 부저와 LED/모터 동작을 동시에 처리하기 위해 스레드 대신 asyncio 태스크 사용
+import threading
+from contextlib import asynccontextmanager
+from clock import get_clock # [NEW] 시간/대기 추상화 (가상 시계로 빠른 시나리오 실행 가능)
+from controller import DoorlockController # [NEW] asyncio 컨트롤러 (키 입력/효과/타이머)
+from scheduler import TimerScheduler # [NEW] 만료 시각 힙 기반 타이머 스케줄러
+from keypad import (InterruptKeypad, KeyInputThread, KeyQueue, KeypadDebouncer, # [NEW] 키패드 입력/키 큐/디바운스
+                    AdaptivePollSchedule, FakeGpioRegisters, GpioMemBank, POLICY_BUFFER, POLICY_DROP,
+                    POLICY_PREEMPT, DEBOUNCE_WINDOW)
 
 
-# 부저 동시 접근 제어를 위한 Lock 객체 (Thread-Safety 확보)
-BUZZER_LOCK = threading.Lock() 
+# [NEW] 모든 시간 계산/대기에 사용하는 시계 (DOORLOCK_TIME_WARP=1000 이면 1000배속 가상 시계)
+CLOCK = get_clock()
+# [NEW] LED/부저/모터/자동 잠김의 모든 만료 시각을 관리하는 스케줄러 (컨트롤러가 실행)
+# 반복 동작은 Ticker로 "이전 만료 시각 + 간격"까지 기다리므로 누적 오차 없이 정확한 주기를 유지
+SCHEDULER = TimerScheduler(CLOCK)
+
+# 부저 동시 접근 제어를 위한 Lock 객체 (태스크 간 동시 연주 방지)
+BUZZER_LOCK = asyncio.Lock() 
 
 
 # ==================== 전역 변수 및 핀 설정 ====================
@@ -17,6 +30,7 @@ BUZZER_PIN = 17    # 부저
 
 FREQUENCY = 100
 LOCK_DURATION = 5       # 문이 열린 후 자동 잠김 시간
+RELOCK_TIMER = "relock" # [NEW] 자동 잠김 타이머 이름 (컨트롤러가 관리)
 
 # 비밀번호 및 특수 코드 정의
 SECRET_CODE = "1234"    # 일반 비밀번호
@@ -52,6 +66,7 @@ LOCKDOWN_DURATION = 15  # 락다운 시간 (초)
 failed_attempts = 0     # 현재 실패 횟수 (전역에서 관리)
 lockdown_end_time = 0   # 락다운 종료 시간 (Unix Timestamp)
 is_panic_mode = False   # 패닉 모드 상태 플래그
+is_door_open = False    # [NEW] 문 열림 상태 (자동 잠김 타이머가 대기 중인 동안 True)
 
 # [NEW STATE VARIABLES for Guest/Admin]
 # NOTE: 실제 도어락에서는 이 값들을 파일에 저장해야 재부팅 후에도 유지됩니다.
@@ -65,6 +80,29 @@ is_admin_mode = False   # 관리자 비밀번호 변경 모드 플래그
 
 # 1차원 배열 키패드 버튼 핀
 KEYPAD_PB = [6, 12, 13, 16, 19, 20, 26, 21]
+# [NEW] 키패드 입력 방식: True면 엣지 인터럽트, False면 적응형 폴링
+USE_KEYPAD_INTERRUPT = True
+# [NEW] 적응형 폴링 주기 (폴링 방식일 때): 유휴 시 느리게, 입력 중에는 빠르게
+KEYPAD_IDLE_INTERVAL = 0.05 # 유휴 샘플링 주기 (초)
+KEYPAD_ACTIVE_INTERVAL = 0.002 # 입력 중 샘플링 주기 (초)
+KEYPAD_IDLE_TIMEOUT = 5.0 # 마지막 입력 후 이 시간이 지나면 유휴 주기로 복귀 (초)
+# [NEW] 키별 디바운스 설정 (떨림 히스토그램을 보고 안정 시간을 조정)
+KEY_DEBOUNCE_METHOD = DEBOUNCE_WINDOW # DEBOUNCE_WINDOW(시간 창) 또는 DEBOUNCE_INTEGRATOR(적분기)
+KEY_DEBOUNCE_TIME = 0.02 # 눌림/뗌 확정에 필요한 안정 시간 (초)
+KEYPAD_BURST_INTERVAL = 0.001 # 떨림 확인 중 샘플링 주기 (초)
+# [NEW] /dev/gpiomem 레지스터를 한 번 읽어 모든 키를 샘플링 (사용할 수 없으면 핀별 GPIO.input)
+USE_GPIOMEM_BANK = True
+
+# [NEW] 도어락 상태별 키 입력 처리 정책 (블로킹 시퀀스 중 들어온 키를 어떻게 할지)
+KEY_POLICIES = {
+    "idle": POLICY_BUFFER,      # 대기 중: 바로 처리
+    "unlock": POLICY_BUFFER,    # 문 열림/자동 잠김 대기 중: 보관 후 잠기면 처리
+    "fail": POLICY_BUFFER,      # 실패 경고 중: 보관 (바로 다시 입력 가능)
+    "admin": POLICY_BUFFER,     # 관리자 모드 톤/피드백 중: 보관
+    "lockdown": POLICY_DROP,    # 락다운 중: 모든 입력 무시
+    "special": POLICY_BUFFER,   # 경보 모드(구급차/소방차/도둑) 중: 보관 (아무 키나 눌러 경보를 끌 수 없음)
+    "cosmetic": POLICY_PREEMPT, # 연출용 모드(디스코/스텔스/함정) 중: 보관하고 모드를 즉시 종료
+}
 
 # 부저 주파수 및 톤 정의
 NOTES = {
@@ -120,6 +158,7 @@ ALARM_LOW = 300
 ALARM_TIME = 0.1 
 
 # ==================== GPIO 초기화 ====================
+GPIO = get_gpio() # [NEW] DOORLOCK_GPIO_BACKEND 환경 변수로 백엔드 선택 (기본: auto)
 GPIO.setmode(GPIO.BCM)
 GPIO.setwarnings(False)
 
@@ -143,23 +182,33 @@ buzzer_pwm.start(0)
 
 # ==================== 부저 연주 함수 ====================
 
-def test_buzzer():
+@asynccontextmanager
+async def buzzer_session():
+    """[NEW] 부저 사용권 획득 (연주가 끝나거나 태스크가 취소되면 반드시 소리 끄기)"""
+    async with BUZZER_LOCK:
+        try:
+            yield
+        finally:
+            buzzer_pwm.ChangeDutyCycle(0)
+
+async def test_buzzer():
     """Buzzer 핀 연결 및 작동 테스트 (Passive Buzzer 기준)"""
     print("--- [BUZZER TEST] 2초간 부저 테스트를 시작합니다. 소리가 나는지 확인하세요. ---")
     
     test_duration = 0.5
     
-    with BUZZER_LOCK:
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("test_buzzer")
         try:
             # 테스트 톤 1 (1000Hz)
             buzzer_pwm.ChangeDutyCycle(50)
             buzzer_pwm.ChangeFrequency(1000)
-            time.sleep(test_duration)
+            await ticker.wait(test_duration)
             print("테스트 톤 1 완료")
 
             # 테스트 톤 2 (500Hz)
             buzzer_pwm.ChangeFrequency(500)
-            time.sleep(test_duration)
+            await ticker.wait(test_duration)
             print("테스트 톤 2 완료")
             
         except Exception as e:
@@ -168,11 +217,12 @@ def test_buzzer():
             # 테스트 종료 후 반드시 부저 끄기
             buzzer_pwm.ChangeDutyCycle(0)
             print("--- [BUZZER TEST] 테스트 완료. ---")
-            time.sleep(1) # 잠시 대기
+            await ticker.wait(1) # 잠시 대기
 
-def play_tone(notes_list, cycle_count=1):
+async def play_tone(notes_list, cycle_count=1):
     """주어진 음표 리스트를 연주"""
-    with BUZZER_LOCK:
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_tone")
         buzzer_pwm.ChangeDutyCycle(50) # 소리 켜기
         
         for _ in range(cycle_count):
@@ -186,27 +236,29 @@ def play_tone(notes_list, cycle_count=1):
                     buzzer_pwm.ChangeFrequency(freq)
                     buzzer_pwm.ChangeDutyCycle(50) # 소리 켜기
                 
-                time.sleep(duration)
+                await ticker.wait(duration)
                 
         buzzer_pwm.ChangeDutyCycle(0) # 연주 종료 후 소리 끄기
 
-def play_keypress_tone():
+async def play_keypress_tone():
     """키 입력 피드백 톤"""
     # 키 입력 톤은 짧게 재생되어야 하므로, 락 없이 스레드에서 직접 재생
     # 하지만 BUZZER_LOCK이 다른 긴 톤과 충돌하는 것을 막아주므로 유지
-    with BUZZER_LOCK:
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_keypress_tone")
         try:
             buzzer_pwm.ChangeDutyCycle(50) 
             buzzer_pwm.ChangeFrequency(NOTES['C5'])
-            time.sleep(NOTE_DURATION * 0.2) 
+            await ticker.wait(NOTE_DURATION * 0.2) 
         except Exception as e:
             print(f"키 입력 톤 재생 중 오류 발생: {e}") 
         finally:
             buzzer_pwm.ChangeDutyCycle(0)
 
-def play_fur_elise_success_tone():
+async def play_fur_elise_success_tone():
     """비밀번호 성공 톤 (엘리제를 위하여)"""
-    with BUZZER_LOCK:
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_fur_elise_success_tone")
         buzzer_pwm.ChangeDutyCycle(50) 
         for note, duration_mult in FUR_ELISE_NOTES[:5]:
             freq = NOTES.get(note)
@@ -218,66 +270,66 @@ def play_fur_elise_success_tone():
                 buzzer_pwm.ChangeFrequency(freq)
                 buzzer_pwm.ChangeDutyCycle(50) 
                 
-            time.sleep(duration)
+            await ticker.wait(duration)
         buzzer_pwm.ChangeDutyCycle(0)
 
-def play_siren(high_freq, low_freq, duration, total_time):
+async def play_siren(high_freq, low_freq, duration, total_time):
     """사이렌 소리 (구급차 또는 소방차)를 지정된 시간 동안 반복"""
-    with BUZZER_LOCK:
-        start_time = time.time()
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_siren")
         buzzer_pwm.ChangeDutyCycle(50) # 소리 켜기
         
-        while time.time() - start_time < total_time:
+        while ticker.elapsed() < total_time:
             buzzer_pwm.ChangeFrequency(high_freq)
-            time.sleep(duration)
+            await ticker.wait(duration)
             buzzer_pwm.ChangeFrequency(low_freq)
-            time.sleep(duration)
+            await ticker.wait(duration)
         
         buzzer_pwm.ChangeDutyCycle(0) # 종료 후 소리 끄기
 
-def play_ambulance_siren():
+async def play_ambulance_siren():
     """구급차 사이렌 (10초)"""
-    play_siren(SIREN_HIGH_AMB, SIREN_LOW_AMB, SIREN_TIME, SPECIAL_MODE_DURATION)
+    await play_siren(SIREN_HIGH_AMB, SIREN_LOW_AMB, SIREN_TIME, SPECIAL_MODE_DURATION)
 
-def play_firefighter_siren():
+async def play_firefighter_siren():
     """소방차 사이렌 (10초)"""
-    play_siren(SIREN_HIGH_FIRE, SIREN_LOW_FIRE, SIREN_TIME, SPECIAL_MODE_DURATION)
+    await play_siren(SIREN_HIGH_FIRE, SIREN_LOW_FIRE, SIREN_TIME, SPECIAL_MODE_DURATION)
 
-def play_burglar_alarm():
+async def play_burglar_alarm():
     """도둑 경보 (다급한 소리 10초)"""
-    with BUZZER_LOCK:
-        start_time = time.time()
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_burglar_alarm")
         buzzer_pwm.ChangeDutyCycle(50) # 소리 켜기
         
-        while time.time() - start_time < SPECIAL_MODE_DURATION:
+        while ticker.elapsed() < SPECIAL_MODE_DURATION:
             buzzer_pwm.ChangeFrequency(ALARM_HIGH)
             buzzer_pwm.ChangeDutyCycle(50)
-            time.sleep(ALARM_TIME)
+            await ticker.wait(ALARM_TIME)
             buzzer_pwm.ChangeFrequency(ALARM_LOW)
-            time.sleep(ALARM_TIME)
+            await ticker.wait(ALARM_TIME)
         
         buzzer_pwm.ChangeDutyCycle(0) # 종료 후 소리 끄기
 
-def play_trap_tone():
+async def play_trap_tone():
     """함정 멜로디 (10초 동안 반복)"""
     melody_time = sum(d for n, d in TRAP_MELODY) * NOTE_DURATION
     cycle_count = int(SPECIAL_MODE_DURATION / melody_time) + 1
-    play_tone(TRAP_MELODY, cycle_count=cycle_count)
+    await play_tone(TRAP_MELODY, cycle_count=cycle_count)
     
-def play_disco_tone():
+async def play_disco_tone():
     """디스코 모드 톤 (15초 동안 빠르게 반복)"""
-    with BUZZER_LOCK:
-        start_time = time.time()
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_disco_tone")
         
         # 멜로디의 1회 재생 시간 계산
         melody_time = sum(d for n, d in DISCO_MELODY) * NOTE_DURATION 
         cycle_count = int(PARTY_MODE_DURATION / melody_time) + 1
         
         for _ in range(cycle_count):
-            if time.time() - start_time >= PARTY_MODE_DURATION:
+            if ticker.elapsed() >= PARTY_MODE_DURATION:
                 break
             for note, duration_mult in DISCO_MELODY:
-                if time.time() - start_time >= PARTY_MODE_DURATION:
+                if ticker.elapsed() >= PARTY_MODE_DURATION:
                     break
                     
                 freq = NOTES.get(note)
@@ -289,71 +341,73 @@ def play_disco_tone():
                     buzzer_pwm.ChangeFrequency(freq)
                     buzzer_pwm.ChangeDutyCycle(50)
                 
-                time.sleep(duration)
+                await ticker.wait(duration)
         
         buzzer_pwm.ChangeDutyCycle(0)
 
-def play_stealth_tone():
+async def play_stealth_tone():
     """스텔스 모드 톤 (저주파수 펄스, 조용함)"""
     # 이 톤은 단발성이므로 락을 잡고 짧게 재생
-    with BUZZER_LOCK:
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_stealth_tone")
         try:
             buzzer_pwm.ChangeDutyCycle(30) # 듀티 사이클을 낮춰 더 조용하게
             buzzer_pwm.ChangeFrequency(STEALTH_TONE_FREQ)
-            time.sleep(NOTE_DURATION * 0.5) 
+            await ticker.wait(NOTE_DURATION * 0.5) 
         except Exception as e:
             print(f"스텔스 톤 재생 중 오류 발생: {e}") 
         finally:
             buzzer_pwm.ChangeDutyCycle(0)
 
-def play_super_siren():
+async def play_super_siren():
     """[NEW] 5회 실패 시 60초간 작동하는 매우 강력한 경고음"""
     SUPER_HIGH = 1500 # 더 높은 주파수
     SUPER_LOW = 300   # 더 낮은 주파수
     SUPER_TIME = 0.03 # 매우 빠르게 전환
     
-    with BUZZER_LOCK:
-        start_time = time.time()
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_super_siren")
         # 락다운 지속 시간 동안만 재생
-        while time.time() - start_time < LOCKDOWN_DURATION:
+        while ticker.elapsed() < LOCKDOWN_DURATION:
             # 1. 고주파 톤
             buzzer_pwm.ChangeFrequency(SUPER_HIGH)
             buzzer_pwm.ChangeDutyCycle(50) 
-            time.sleep(SUPER_TIME)
+            await ticker.wait(SUPER_TIME)
             
             # 2. 저주파 톤
             buzzer_pwm.ChangeFrequency(SUPER_LOW)
-            time.sleep(SUPER_TIME)
+            await ticker.wait(SUPER_TIME)
             
         buzzer_pwm.ChangeDutyCycle(0) # 종료 후 소리 끄기
 
-def play_fail_siren():
+async def play_fail_siren():
     """비밀번호 실패 톤"""
-    with BUZZER_LOCK:
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_fail_siren")
         buzzer_pwm.ChangeDutyCycle(50) 
         for _ in range(3):
             buzzer_pwm.ChangeFrequency(900)
             buzzer_pwm.ChangeDutyCycle(50)
-            time.sleep(0.15)
+            await ticker.wait(0.15)
             buzzer_pwm.ChangeFrequency(650)
             buzzer_pwm.ChangeDutyCycle(50)
-            time.sleep(0.15)
+            await ticker.wait(0.15)
         buzzer_pwm.ChangeDutyCycle(0)
 
-def play_dingdong_tone():
+async def play_dingdong_tone():
     """[NEW] 손님 코드 성공 톤 (딩동)"""
-    play_tone(DINGDONG_TONE)
+    await play_tone(DINGDONG_TONE)
     
-def play_admin_mode_tone():
+async def play_admin_mode_tone():
     """[NEW] 관리자 변경 모드 진입 톤 (느린 띠링-띠링-)"""
     # 2회 반복 연주
-    play_tone(ADMIN_MODE_TONE, cycle_count=2)
+    await play_tone(ADMIN_MODE_TONE, cycle_count=2)
 
-def play_admin_fail_tone():
+async def play_admin_fail_tone():
     """[NEW] 관리자 모드 실패/불일치 톤"""
-    play_tone(ADMIN_FAIL_TONE, cycle_count=1)
+    await play_tone(ADMIN_FAIL_TONE, cycle_count=1)
 
-def play_silent_panic_pulse(total_duration):
+async def play_silent_panic_pulse(total_duration):
     """
     [MODIFIED] 무음 패닉 펄스: 주변에 들리지 않도록 매우 낮은 주파수와
     매우 낮은 듀티 사이클로 '웅' 소리를 지정된 시간 동안 반복 발생시키는 톤.
@@ -362,23 +416,23 @@ def play_silent_panic_pulse(total_duration):
     PULSE_ON_TIME = 0.5 # 0.5초간 켜짐
     PULSE_OFF_TIME = 1.0 # 1.0초간 꺼짐 (펄스 간 간격) - 총 1.5초 주기
     
-    with BUZZER_LOCK:
-        start_time = time.time()
+    async with buzzer_session():
+        ticker = SCHEDULER.ticker("play_silent_panic_pulse")
         
         try:
             # 주파수: 100Hz (매우 낮은 저음)
             buzzer_pwm.ChangeFrequency(100)
             
             # 지정된 시간(10초) 동안 펄스를 반복합니다.
-            while time.time() - start_time < total_duration:
+            while ticker.elapsed() < total_duration:
                 # 켜짐: 5% 듀티 사이클 (매우 조용하게)
                 buzzer_pwm.ChangeDutyCycle(5)
                 # 남은 시간을 고려하여 sleep (정확한 시간 관리를 위해)
-                time.sleep(min(PULSE_ON_TIME, total_duration - (time.time() - start_time)))
+                await ticker.wait(min(PULSE_ON_TIME, total_duration - ticker.elapsed()))
                 
                 # 꺼짐: 펄스 간 간격
                 buzzer_pwm.ChangeDutyCycle(0)
-                time.sleep(min(PULSE_OFF_TIME, total_duration - (time.time() - start_time)))
+                await ticker.wait(min(PULSE_OFF_TIME, total_duration - ticker.elapsed()))
                 
         except Exception as e:
             print(f"무음 패닉 펄스 재생 중 오류 발생: {e}") 
@@ -388,130 +442,171 @@ def play_silent_panic_pulse(total_duration):
 
 
 # ==================== 키패드 읽기 ====================
-prev_state = [GPIO.input(pin) for pin in KEYPAD_PB]
+# [NEW] 레지스터 뱅크 읽기 준비 (/dev/gpiomem이 없으면 핀별 읽기로 대체)
+# 시뮬레이터에서는 실제 /dev/gpiomem 대신 시뮬레이터 입력 값을 따라가는 가짜 레지스터 파일을 매핑
+keypad_bank = None
+keypad_registers = None
+if USE_GPIOMEM_BANK:
+    try:
+        if GPIO.name == "sim":
+            keypad_registers = GPIO.attach_registers(FakeGpioRegisters())
+            keypad_bank = GpioMemBank(KEYPAD_PB, path=keypad_registers.path)
+        else:
+            keypad_bank = GpioMemBank(KEYPAD_PB)
+    except (OSError, ValueError) as e:
+        print(f"/dev/gpiomem 사용 불가, 핀별 GPIO.input()으로 읽습니다: {e}")
+
+def read_keypad_levels():
+    """[NEW] 키패드 핀 레벨을 한 번에 읽어 목록으로 반환"""
+    if keypad_bank is not None:
+        return keypad_bank.read_levels() # 레지스터 1회 읽기 (8개 키 동시 샘플)
+    return [GPIO.input(pin) for pin in KEYPAD_PB]
 
 def check_keypad():
-    """키패드 눌림 감지 및 상태 갱신 (엣지 감지)"""
-    global prev_state
-    key_pressed = None
-    
-    for idx, pin in enumerate(KEYPAD_PB):
-        current_state = GPIO.input(pin)
-        
-        # LOW -> HIGH 변화 (눌림) 감지
-        if current_state == GPIO.HIGH and prev_state[idx] == GPIO.LOW:
-            key_pressed = str(idx + 1) 
-        
-        # 상태 갱신
-        prev_state[idx] = current_state
-    
-    return key_pressed 
+    """[MODIFIED] 키패드를 1회 샘플링하여 키별 디바운스 상태 머신에 전달
+    (확정된 눌림은 KEY_QUEUE로 들어가고, 확정된 (키, 눌림/뗌) 목록을 반환)"""
+    return KEY_DEBOUNCER.update(read_keypad_levels())
+
+# [NEW] 키 입력 큐 (입력 스레드가 채우고 컨트롤러가 꺼냄)
+KEY_QUEUE = KeyQueue(policies=KEY_POLICIES)
+KEY_DEBOUNCER = KeypadDebouncer(len(KEYPAD_PB), KEY_QUEUE, KEY_DEBOUNCE_TIME,
+                                KEY_DEBOUNCE_METHOD, KEYPAD_BURST_INTERVAL)
+
+# [NEW] 인터럽트 기반 키패드: 엣지가 오면 입력 스레드를 깨움 (등록 실패 시 폴링으로 대체)
+keypad_wake_event = threading.Event()
+keypad_interrupt = None
+if USE_KEYPAD_INTERRUPT:
+    keypad_interrupt = InterruptKeypad(GPIO, KEYPAD_PB, keypad_wake_event)
+    try:
+        keypad_interrupt.start()
+    except RuntimeError as e:
+        print(f"키패드 인터럽트 등록 실패, 폴링 방식으로 전환합니다: {e}")
+        keypad_interrupt = None
+
+# [NEW] 폴링 방식일 때 사용하는 적응형 샘플링 스케줄
+KEYPAD_POLL_SCHEDULE = AdaptivePollSchedule(KEYPAD_IDLE_INTERVAL, KEYPAD_ACTIVE_INTERVAL, KEYPAD_IDLE_TIMEOUT)
+
+keypad = KeyInputThread(read_keypad_levels, KEY_DEBOUNCER, KEYPAD_POLL_SCHEDULE, KEYPAD_BURST_INTERVAL,
+                        wake_event=keypad_wake_event if keypad_interrupt is not None else None)
+keypad.start()
 
 # ==================== 도어락 상태 제어 ====================
 def lock_door():
     """도어락을 잠금 상태로 설정 (초기 상태: 빨간불 켜짐)"""
+    global is_door_open
     print("--- [LOCKED] 도어락 잠금 ---")
+    CONTROLLER.cancel_timer(RELOCK_TIMER) # [NEW] 직접 잠근 경우 대기 중인 자동 잠김 취소
+    is_door_open = False
     GPIO.output(RED_PIN, True)     # 잠금 상태: 빨간 LED 켜짐
     GPIO.output(GREEN_PIN, False)
     GPIO.output(MOTOR_ENABLE_PIN, False)
     motor_pwm.ChangeDutyCycle(0)
     buzzer_pwm.ChangeDutyCycle(0) 
 
-def unlock_door():
+def open_door(relock_delay):
+    """[NEW] 문 열림 상태로 두고 relock_delay초 뒤 자동 잠김 타이머 설정 (바로 반환)"""
+    global is_door_open
+    if relock_delay <= 0:
+        print("문이 즉시 잠깁니다.")
+        lock_door()
+        return
+    GPIO.output(RED_PIN, False)
+    GPIO.output(GREEN_PIN, True) # 문 열림 유지 (녹색 LED 켜짐 상태)
+    is_door_open = True
+    CONTROLLER.set_timer(RELOCK_TIMER, relock_delay, lock_door)
+    print(f"--- [OPEN] 문 열림. {relock_delay}초 후 자동으로 잠깁니다. ---")
+
+async def blink_led(pin, on_time, off_time, duration):
+    """[NEW] duration초 동안 LED 깜빡임 (취소되면 즉시 끔)"""
+    ticker = SCHEDULER.ticker("blink_led")
+    try:
+        while ticker.elapsed() < duration:
+            GPIO.output(pin, True)
+            await ticker.wait(on_time)
+            GPIO.output(pin, False)
+            await ticker.wait(off_time)
+    finally:
+        GPIO.output(pin, False)
+
+async def run_motor_pulse(speed, duration):
+    """[NEW] duration초 동안 모터 작동 후 정지 (취소되어도 모터는 반드시 정지)"""
+    ticker = SCHEDULER.ticker("run_motor_pulse")
+    GPIO.output(MOTOR_ENABLE_PIN, True)
+    motor_pwm.ChangeDutyCycle(speed)
+    try:
+        await ticker.wait(duration)
+    finally:
+        GPIO.output(MOTOR_ENABLE_PIN, False) # 모터 정지
+        motor_pwm.ChangeDutyCycle(0)
+
+async def unlock_door():
     """비밀번호 성공 시 문 열림 시퀀스 (녹색 LED 깜빡임 및 모터 작동)"""
     print("--- [UNLOCKED] 비밀번호 일치! 문 열림 ---")
     GPIO.output(RED_PIN, False) # 잠금 해제, 빨간불 끔
     
     # 1. 모터 작동 및 녹색 LED 깜빡임 및 성공 톤 재생 (동시에)
-    GPIO.output(MOTOR_ENABLE_PIN, True)
-    motor_pwm.ChangeDutyCycle(80) # 일반 속도
-    
-    # 부저 성공 톤을 별도 스레드에서 실행
-    buzzer_thread = threading.Thread(target=play_fur_elise_success_tone)
-    buzzer_thread.start()
+    # 부저 성공 톤을 별도 태스크에서 실행
+    buzzer_task = asyncio.create_task(play_fur_elise_success_tone())
     
     # 깜빡임 및 모터 작동 시간 (2.0초)
     blink_duration = 2.0 
-    start_time = time.time()
-    
-    while time.time() - start_time < blink_duration:
-        # 녹색 LED 깜빡임
-        GPIO.output(GREEN_PIN, True)
-        time.sleep(0.15)
-        GPIO.output(GREEN_PIN, False)
-        time.sleep(0.15)
-        
-    GPIO.output(MOTOR_ENABLE_PIN, False) # 모터 정지
-    motor_pwm.ChangeDutyCycle(0)
-    
-    buzzer_thread.join() # 톤 재생이 완전히 끝날 때까지 대기
-
-    # 2. 문 열림 유지 (녹색 LED 켜짐 상태)
-    GPIO.output(GREEN_PIN, True)
-    
-    # 남은 잠금 유지 시간 계산
-    remaining_lock_duration = LOCK_DURATION - blink_duration
-    if remaining_lock_duration > 0:
-        print(f"문이 {remaining_lock_duration}초 후 자동으로 잠깁니다.")
-        time.sleep(remaining_lock_duration)
-    else:
-        print("문이 즉시 잠깁니다.")
+    try:
+        await asyncio.gather(blink_led(GREEN_PIN, 0.15, 0.15, blink_duration),
+                             run_motor_pulse(80, blink_duration))
+        await buzzer_task # 톤 재생이 완전히 끝날 때까지 대기
+    finally:
+        buzzer_task.cancel() # 시퀀스가 취소되면 톤도 함께 중단
 
-    lock_door()
+    # 2. 문 열림 유지 및 남은 시간 후 자동 잠김 (타이머로 예약하고 바로 반환하여 키 입력 계속 처리)
+    open_door(LOCK_DURATION - blink_duration)
 
-def password_fail_sequence(current_input):
+async def password_fail_sequence(current_input):
     """비밀번호 실패 시 경고 시퀀스 (5회 미만)"""
     print(f"--- [FAILED] 잘못된 비밀번호: {current_input} ---")
-    play_fail_siren()
+    await play_fail_siren()
+    ticker = SCHEDULER.ticker("password_fail_sequence")
     for _ in range(3): # 적색 LED 깜빡임
         GPIO.output(RED_PIN, False)
-        time.sleep(0.1)
+        await ticker.wait(0.1)
         GPIO.output(RED_PIN, True)
-        time.sleep(0.1)
+        await ticker.wait(0.1)
     lock_door()
     
-def handle_lockdown_mode():
+async def handle_lockdown_mode():
     """
     [NEW] 비밀번호 5회 실패 시 60초 락다운 모드 처리
     """
-    global lockdown_end_time
+    global lockdown_end_time, failed_attempts
     
     print("=========================================================")
     print(f"!!! [LOCKDOWN ACTIVATED] 비밀번호 {FAILURE_LIMIT}회 실패! {LOCKDOWN_DURATION}초 락다운 !!!")
     print("=========================================================")
     
     # 락다운 타이머 설정
-    lockdown_end_time = time.time() + LOCKDOWN_DURATION
+    lockdown_end_time = CLOCK.time() + LOCKDOWN_DURATION
     
     # 모터 정지 및 잠금 상태 유지
     GPIO.output(MOTOR_ENABLE_PIN, False)
     motor_pwm.ChangeDutyCycle(0)
     
-    # 부저 경고음을 별도 스레드에서 60초간 실행
-    buzzer_thread = threading.Thread(target=play_super_siren)
-    buzzer_thread.start()
-    
-    # LED 경고: 빨간색 초고속 깜빡임
-    start_time = time.time()
-    
-    while time.time() < lockdown_end_time:
-        # 락다운 지속 시간 동안 지속적으로 빨간불을 빠르게 깜빡임
-        GPIO.output(RED_PIN, True)
-        GPIO.output(GREEN_PIN, False)
-        time.sleep(0.05)
-        
-        GPIO.output(RED_PIN, False)
-        time.sleep(0.05)
-        
-    # LED 상태 초기화 (경고음은 스레드에서 자동으로 종료됨)
-    GPIO.output(RED_PIN, False)
+ 
     GPIO.output(GREEN_PIN, False)
+    try:
+        # 부저 경고음과 LED 경고(빨간색 초고속 깜빡임)를 락다운 시간 동안 동시에 실행
+        await asyncio.gather(play_super_siren(),
+                             blink_led(RED_PIN, 0.05, 0.05, LOCKDOWN_DURATION))
+    finally:
+        # LED 상태 초기화
+        GPIO.output(RED_PIN, False)
+        GPIO.output(GREEN_PIN, False)
 
-    # 스레드가 종료될 때까지 대기
-    if buzzer_thread.is_alive():
-        buzzer_thread.join()
+    # 락다운 해제: 실패 횟수 초기화 후 잠금 상태로 복귀
+    print("--- [LOCKDOWN ENDED] 락다운 해제. 도어락 잠금 상태로 복귀 ---")
+    lockdown_end_time = 0
+    failed_attempts = 0
+    lock_door()
         
-def handle_guest_access():
+async def handle_guest_access():
     """
     [NEW] 손님 코드 처리: 문 열림 및 코드 일회성/시간 제한 설정 시뮬레이션
     """
@@ -525,41 +620,22 @@ def handle_guest_access():
     GPIO.output(RED_PIN, False) # 잠금 해제, 빨간불 끔
     
     # 1. 모터 작동 및 녹색 LED 깜빡임 및 성공 톤 재생 (동시에)
-    GPIO.output(MOTOR_ENABLE_PIN, True)
-    motor_pwm.ChangeDutyCycle(80) # 일반 속도
-    
-    # 부저 성공 톤을 별도 스레드에서 실행 (딩동 소리)
-    buzzer_thread = threading.Thread(target=play_dingdong_tone)
-    buzzer_thread.start()
+    # 부저 성공 톤을 별도 태스크에서 실행 (딩동 소리)
+    buzzer_task = asyncio.create_task(play_dingdong_tone())
     
     # 깜빡임 및 모터 작동 시간 (2.0초) - unlock_door와 동일하게 유지
     blink_duration = 2.0 
-    start_time = time.time()
-    
-    while time.time() - start_time < blink_duration:
-        # 녹색 LED 깜빡임
-        GPIO.output(GREEN_PIN, True)
-        time.sleep(0.15)
-        GPIO.output(GREEN_PIN, False)
-        time.sleep(0.15)
-        
-    GPIO.output(MOTOR_ENABLE_PIN, False) # 모터 정지
-    motor_pwm.ChangeDutyCycle(0)
-    
-    buzzer_thread.join() # 톤 재생이 완전히 끝날 때까지 대기
-
-    # 2. 문 열림 유지 및 자동 잠김
-    GPIO.output(GREEN_PIN, True)
-    remaining_lock_duration = LOCK_DURATION - blink_duration
-    if remaining_lock_duration > 0:
-        print(f"문이 {remaining_lock_duration}초 후 자동으로 잠깁니다.")
-        time.sleep(remaining_lock_duration)
-    else:
-        print("문이 즉시 잠깁니다.")
+    try:
+        await asyncio.gather(blink_led(GREEN_PIN, 0.15, 0.15, blink_duration),
+                             run_motor_pulse(80, blink_duration))
+        await buzzer_task # 톤 재생이 완전히 끝날 때까지 대기
+    finally:
+        buzzer_task.cancel() # 시퀀스가 취소되면 톤도 함께 중단
 
-    lock_door()
+    # 2. 문 열림 유지 및 자동 잠김 (타이머로 예약)
+    open_door(LOCK_DURATION - blink_duration)
 
-def handle_admin_code_change(current_input):
+async def handle_admin_code_change(current_input):
     """
     [NEW] 관리자 비밀번호 변경 모드 처리 (1515)
     """
@@ -572,14 +648,15 @@ def handle_admin_code_change(current_input):
             change_mode_step = 2
             print(f"--- [ADMIN MODE] 새 비밀번호 ({new_secret_code_temp}) 입력 완료. 확인을 위해 다시 한 번 입력하세요. ---")
             # LED 피드백: 녹색 깜빡임으로 다음 단계 준비 알림
+            ticker = SCHEDULER.ticker("admin_feedback")
             for _ in range(2):
                 GPIO.output(GREEN_PIN, True)
-                time.sleep(0.2)
+                await ticker.wait(0.2)
                 GPIO.output(GREEN_PIN, False)
-                time.sleep(0.2)
+                await ticker.wait(0.2)
         else:
             print("--- [ADMIN MODE FAILED] 4자리 숫자를 입력해야 합니다. 모드 취소. ---")
-            play_admin_fail_tone()
+            await play_admin_fail_tone()
             change_mode_step = 0
             new_secret_code_temp = ""
             is_admin_mode = False
@@ -594,9 +671,9 @@ def handle_admin_code_change(current_input):
             print("=========================================================")
             
             # 성공 톤 및 LED 피드백: 녹색 켜짐
-            play_fur_elise_success_tone()
+            await play_fur_elise_success_tone()
             GPIO.output(GREEN_PIN, True)
-            time.sleep(1.5)
+            await SCHEDULER.sleep(1.5, "admin_feedback")
             
             # 상태 초기화
             change_mode_step = 0
@@ -608,13 +685,14 @@ def handle_admin_code_change(current_input):
             
         else:
             print("--- [ADMIN MODE FAILED] 비밀번호 불일치! 모드 취소. ---")
-            play_admin_fail_tone()
+            await play_admin_fail_tone()
             # LED 피드백: 빨간색 깜빡임
+            ticker = SCHEDULER.ticker("admin_feedback")
             for _ in range(3):
                 GPIO.output(RED_PIN, True)
-                time.sleep(0.1)
+                await ticker.wait(0.1)
                 GPIO.output(RED_PIN, False)
-                time.sleep(0.1)
+                await ticker.wait(0.1)
                 
             # 상태 초기화
             change_mode_step = 0
@@ -629,7 +707,7 @@ def handle_admin_code_change(current_input):
         is_admin_mode = False
         lock_door()
 
-def handle_special_mode(mode_name, motor_speed, buzzer_function, mode_duration):
+async def handle_special_mode(mode_name, motor_speed, buzzer_function, mode_duration):
     """
     특수 모드를 처리하는 함수 (LED/모터/부저 동시 작동)
     """
@@ -639,11 +717,10 @@ def handle_special_mode(mode_name, motor_speed, buzzer_function, mode_duration):
     GPIO.output(MOTOR_ENABLE_PIN, True)
     motor_pwm.ChangeDutyCycle(motor_speed)
     
-    # 부저 함수를 별도 스레드에서 실행하여 LED/모터와 동시에 작동
-    buzzer_thread = threading.Thread(target=buzzer_function)
-    buzzer_thread.start()
+    # 부저 함수를 별도 태스크에서 실행하여 LED/모터와 동시에 작동
+    buzzer_task = asyncio.create_task(buzzer_function())
     
-    start_time = time.time()
+    ticker = SCHEDULER.ticker("handle_special_mode")
     
     # LED 깜빡임 타이밍 및 스타일 설정 (mode_name 기반)
     if mode_name == "Disco Party":
@@ -661,17 +738,19 @@ def handle_special_mode(mode_name, motor_speed, buzzer_function, mode_duration):
 
 
     # 나머지 모드 (AMB/FIRE/BURGLAR/STEALTH)에 대한 일반 깜빡임 로직
-    while time.time() - start_time < mode_duration:
-        
+    # (연출용 모드는 키가 눌리면 컨트롤러가 이 태스크를 취소하여 모드를 즉시 종료,
+    #  경보 모드는 키를 보관만 하고 끝까지 실행)
+    try:
+      while ticker.elapsed() < mode_duration:
         if mode_name in ["Disco Party", "Trap"]:
             # 교차 깜빡임 
             GPIO.output(RED_PIN, True)
             GPIO.output(GREEN_PIN, False)
-            time.sleep(on_time) 
+            await ticker.wait(on_time) 
             
             GPIO.output(RED_PIN, False)
             GPIO.output(GREEN_PIN, True)
-            time.sleep(off_time) 
+            await ticker.wait(off_time) 
 
         else:
             # 동시 또는 단일 색상 깜빡임 (AMB/FIRE/BURGLAR/STEALTH)
@@ -682,22 +761,22 @@ def handle_special_mode(mode_name, motor_speed, buzzer_function, mode_duration):
             
             GPIO.output(RED_PIN, red_on)
             GPIO.output(GREEN_PIN, green_on)
-            time.sleep(on_time)
+            await ticker.wait(on_time)
             
             # 깜빡임을 위해 잠시 끄기
             GPIO.output(RED_PIN, False)
             GPIO.output(GREEN_PIN, False)
-            time.sleep(off_time)
+            await ticker.wait(off_time)
             
-    # 특수 모드 종료
-    if buzzer_thread.is_alive():
-        # 부저 스레드가 완전히 종료될 때까지 대기
-        buzzer_thread.join() 
-        
-    print(f"--- [{mode_name.upper()} MODE] {mode_duration}초 작동 완료. 도어락 잠금 상태로 복귀 ---")
-    lock_door()
+      # 특수 모드 종료: 부저 태스크가 완전히 종료될 때까지 대기
+      await buzzer_task
+      print(f"--- [{mode_name.upper()} MODE] {mode_duration}초 작동 완료. 도어락 잠금 상태로 복귀 ---")
+    finally:
+        # 중단된 경우에도 부저를 멈추고 잠금 상태로 복귀
+        buzzer_task.cancel()
+        lock_door()
 
-def silent_panic_sequence():
+async def silent_panic_sequence():
     """
     [MODIFIED] 무음 패닉 모드: 10초 동안 조용한 저주파 펄스를 발생시키며 15초간 비상 신호를 전송합니다.
     (총 15초 작동, 남은 시간 카운트다운 표시)
@@ -715,10 +794,10 @@ def silent_panic_sequence():
     GPIO.output(MOTOR_ENABLE_PIN, False)
     motor_pwm.ChangeDutyCycle(0)
 
+    ticker = SCHEDULER.ticker("silent_panic_sequence")
     try:
-        # 2. 아주 미세한 저주파 펄스 피드백 (10초 동안 반복)을 별도 스레드에서 시작
-        pulse_thread = threading.Thread(target=play_silent_panic_pulse, args=(PANIC_PULSE_SOUND_DURATION,))
-        pulse_thread.start()
+        # 2. 아주 미세한 저주파 펄스 피드백 (10초 동안 반복)을 별도 태스크에서 시작
+        pulse_task = asyncio.create_task(play_silent_panic_pulse(PANIC_PULSE_SOUND_DURATION))
         
         # 3. 비상 신호 전송 시뮬레이션 (총 15초) 및 카운트다운 로직
         
@@ -726,164 +805,176 @@ def silent_panic_sequence():
         while remaining_time > 0:
             # 1초마다 남은 시간 출력
             print(f"남은 비상 신호 전송 시간: {remaining_time}초")
-            time.sleep(1) 
+            await ticker.wait(1) 
             remaining_time -= 1
         
     except Exception as e:
         print(f"패닉 모드 중 오류 발생: {e}")
         
     finally:
-        # 펄스 스레드가 아직 실행 중일 경우 종료될 때까지 잠시 대기
-        if pulse_thread.is_alive():
-             print("펄스 사운드 스레드 종료 대기...")
-             # 펄스 주기가 1.5초이므로 2초면 충분히 종료됩니다.
-             time.sleep(2) 
+        # 펄스 태스크가 아직 실행 중이면 중단 (취소 시 부저는 자동으로 꺼짐)
+        pulse_task.cancel()
         
         print("--- [SILENT PANIC] 무음 패닉 모드 종료 ---")
         is_panic_mode = False
         lock_door() # 혹시 모를 상태를 초기화하고 잠금 상태 유지
 
 
-# ==================== 메인 루프 ====================
-if __name__ == "__main__":
-    input_code = ""
-    print(f"--- 도어락 시스템 시작 (일반 비밀번호: {SECRET_CODE}, {FAILURE_LIMIT}회 실패 시 {LOCKDOWN_DURATION}초 락다운) ---")
-    
-    try:
-        test_buzzer() 
+# ==================== 키 입력 처리 ====================
+input_code = ""
 
-        # 1. 초기 LED 상태 명확화 (빨간불 켜짐)
-        lock_door() 
+async def handle_key(key):
+    """[NEW] 키 1개 처리 (컨트롤러가 이벤트 루프에서 호출)
+
+    긴 동작(문 열림, 특수 모드, 락다운 등)은 시퀀스 태스크로 시작하고 바로 반환하므로
+    시퀀스가 도는 동안에도 이벤트 루프는 계속 키 입력과 다른 효과를 처리합니다.
+    """
+    global input_code, failed_attempts, is_admin_mode, change_mode_step, new_secret_code_temp
+
+    # 1. 키 입력 피드백 (짧은 소리)
+    CONTROLLER.spawn(play_keypress_tone())
+    
+    print(f"Pressed key: {key}")
+    
+    # -------------------------
+    # --- 관리자 모드 처리 우선 ---
+    # -------------------------
+    if is_admin_mode:
+        if key == '7': # 엔터 역할 (입력 완료)
+            print(f"[ADMIN MODE] 입력 완료: {input_code}")
+            if len(input_code) == 4 and input_code.isdigit():
+                CONTROLLER.start_sequence("admin", handle_admin_code_change(input_code))
+            else:
+                print("[ADMIN MODE] 4자리 숫자만 유효합니다. 다시 입력하세요.")
+                CONTROLLER.spawn(play_admin_fail_tone())
+            input_code = "" # 입력 완료 후 초기화
         
-        while True:
-            current_time = time.time()
+        elif key == '8': # 초기화 역할 (관리자 모드 취소)
+            print("--- [ADMIN MODE CANCELLED] 관리자 모드 취소. ---")
+            CONTROLLER.spawn(play_admin_fail_tone())
+            change_mode_step = 0
+            new_secret_code_temp = ""
+            is_admin_mode = False
+            input_code = ""
+            lock_door()
             
-            # --- 락다운 상태 확인 및 처리 ---
-            if current_time < lockdown_end_time:
-                remaining = int(lockdown_end_time - current_time)
-                # 락다운 중에는 키 입력 무시하고 시간만 체크
-                if remaining <= 0:
-                    print("--- [LOCKDOWN ENDED] 락다운 해제. 도어락 잠금 상태로 복귀 ---")
-                    lock_door()
-                    lockdown_end_time = 0
-                    failed_attempts = 0 # 락다운 해제 시 실패 횟수 초기화
-                
-                time.sleep(0.1) # 락다운 중에는 메인 루프 지연 시간을 늘려 CPU 부담 감소
-                continue # 키 입력 처리 건너뛰기
-            # --- 락다운 상태 확인 끝 ---
+        elif key.isdigit() and len(input_code) < 4: # 숫자 키 입력 (4자리까지 허용)
+            input_code += key
+            print(f"[ADMIN MODE] 입력 중: {input_code}")
             
-            key = check_keypad()
+        # 관리자 모드 중에는 아래 일반 로직을 건너뜁니다.
+        return
+
+    # -------------------------
+    # --- 일반/특수 코드 처리 ---
+    # -------------------------
+
+    if key == '7': # 엔터 역할 (입력 완료)
+        print(f"입력 완료: {input_code}")
+        
+        # 1. 일반 비밀번호 체크
+        if input_code == SECRET_CODE:
+            if is_door_open:
+                # [NEW] 문이 열려 있는 동안 다시 입력하면 자동 잠김 시간 연장
+                CONTROLLER.extend_timer(RELOCK_TIMER, LOCK_DURATION)
+                print(f"--- [OPEN] 자동 잠김 시간 연장: {LOCK_DURATION}초 후 잠깁니다. ---")
+            else:
+                CONTROLLER.start_sequence("unlock", unlock_door())
+            failed_attempts = 0 # 성공 시 실패 횟수 초기화
+        
+        # 2. [UPDATED] 손님 코드 체크 (2424)
+        elif input_code == GUEST_CODE:
+            # RPi 시뮬레이션에서는 '일회성 플래그'만 사용
+            if is_guest_code_used:
+                print("--- [GUEST ACCESS DENIED] 손님 코드가 이미 사용되었습니다. ---")
+                CONTROLLER.start_sequence("fail", password_fail_sequence(input_code)) # 실패 시퀀스 사용
+            else:
+                CONTROLLER.start_sequence("unlock", handle_guest_access())
+                failed_attempts = 0 # 성공 시 실패 횟수 초기화
+
+        # 3. [UPDATED] 관리자 변경 코드 체크 (1515)
+        elif input_code == ADMIN_CODE:
+            is_admin_mode = True
+            change_mode_step = 1 # 비밀번호 입력 대기 상태로 변경
+            print("--- [ADMIN MODE] 비밀번호 변경 모드에 진입합니다. 새로운 4자리 비밀번호를 입력하세요. ---")
+            CONTROLLER.spawn(play_admin_mode_tone())
             
-            if key: # 키가 눌렸을 때만 처리
-                
-                # 1. 키 입력 피드백 (짧은 소리)
-                keypress_thread = threading.Thread(target=play_keypress_tone)
-                keypress_thread.start()
-                
-                print(f"Pressed key: {key}")
+        # 4. 기존 특수 코드 체크
+        elif input_code == AMBULANCE_CODE:
+            CONTROLLER.start_sequence("special", handle_special_mode("Ambulance", 80, play_ambulance_siren, SPECIAL_MODE_DURATION))
+        elif input_code == FIREFIGHTER_CODE:
+            CONTROLLER.start_sequence("special", handle_special_mode("Firefighter", 80, play_firefighter_siren, SPECIAL_MODE_DURATION))
+        elif input_code == DISCO_CODE:
+            CONTROLLER.start_sequence("cosmetic", handle_special_mode("Disco Party", 0, play_disco_tone, PARTY_MODE_DURATION))
+        elif input_code == STEALTH_CODE:
+            CONTROLLER.start_sequence("cosmetic", handle_special_mode("Stealth", STEALTH_PWM, play_stealth_tone, SPECIAL_MODE_DURATION))
+        elif input_code == BURGLAR_CODE:
+            CONTROLLER.start_sequence("special", handle_special_mode("Burglar Alert", 30, play_burglar_alarm, SPECIAL_MODE_DURATION))
+        elif input_code == TRAP_CODE:
+            CONTROLLER.start_sequence("cosmetic", handle_special_mode("Trap", 30, play_trap_tone, SPECIAL_MODE_DURATION))
+        elif input_code == PANIC_CODE: # [NEW] 무음 패닉 모드 (1125)
+            # 이전에 활성화된 패닉 모드가 없다면 새로 시작
+            if not is_panic_mode:
+                CONTROLLER.spawn(silent_panic_sequence())
+            else:
+                print("--- [SILENT PANIC] 이미 패닉 모드가 활성화되어 있습니다. ---")
                 
-                # -------------------------
-                # --- 관리자 모드 처리 우선 ---
-                # -------------------------
-                if is_admin_mode:
-                    if key == '7': # 엔터 역할 (입력 완료)
-                        print(f"[ADMIN MODE] 입력 완료: {input_code}")
-                        if len(input_code) == 4 and input_code.isdigit():
-                            handle_admin_code_change(input_code)
-                        else:
-                            print("[ADMIN MODE] 4자리 숫자만 유효합니다. 다시 입력하세요.")
-                            play_admin_fail_tone() 
-                        input_code = "" # 입력 완료 후 초기화
-                    
-                    elif key == '8': # 초기화 역할 (관리자 모드 취소)
-                        print("--- [ADMIN MODE CANCELLED] 관리자 모드 취소. ---")
-                        play_admin_fail_tone() 
-                        change_mode_step = 0
-                        new_secret_code_temp = ""
-                        is_admin_mode = False
-                        input_code = ""
-                        lock_door()
-                        
-                    elif key.isdigit() and len(input_code) < 4: # 숫자 키 입력 (4자리까지 허용)
-                        input_code += key
-                        print(f"[ADMIN MODE] 입력 중: {input_code}")
-                        
-                    # 관리자 모드 중에는 아래 일반 로직을 건너뜁니다.
-                    continue 
-
-                # -------------------------
-                # --- 일반/특수 코드 처리 ---
-                # -------------------------
-
-                if key == '7': # 엔터 역할 (입력 완료)
-                    print(f"입력 완료: {input_code}")
-                    
-                    # 1. 일반 비밀번호 체크
-                    if input_code == SECRET_CODE:
-                        unlock_door() 
-                        failed_attempts = 0 # 성공 시 실패 횟수 초기화
-                    
-                    # 2. [UPDATED] 손님 코드 체크 (2424)
-                    elif input_code == GUEST_CODE:
-                        # RPi 시뮬레이션에서는 '일회성 플래그'만 사용
-                        if is_guest_code_used:
-                            print("--- [GUEST ACCESS DENIED] 손님 코드가 이미 사용되었습니다. ---")
-                            password_fail_sequence(input_code) # 실패 시퀀스 사용
-                        else:
-                            handle_guest_access()
-                            failed_attempts = 0 # 성공 시 실패 횟수 초기화
-
-                    # 3. [UPDATED] 관리자 변경 코드 체크 (1515)
-                    elif input_code == ADMIN_CODE:
-                        is_admin_mode = True
-                        change_mode_step = 1 # 비밀번호 입력 대기 상태로 변경
-                        print("--- [ADMIN MODE] 비밀번호 변경 모드에 진입합니다. 새로운 4자리 비밀번호를 입력하세요. ---")
-                        play_admin_mode_tone()
-                        
-                    # 4. 기존 특수 코드 체크
-                    elif input_code == AMBULANCE_CODE:
-                        handle_special_mode("Ambulance", 80, play_ambulance_siren, SPECIAL_MODE_DURATION)
-                    elif input_code == FIREFIGHTER_CODE:
-                        handle_special_mode("Firefighter", 80, play_firefighter_siren, SPECIAL_MODE_DURATION)
-                    elif input_code == DISCO_CODE:
-                        handle_special_mode("Disco Party", 0, play_disco_tone, PARTY_MODE_DURATION) 
-                    elif input_code == STEALTH_CODE:
-                        handle_special_mode("Stealth", STEALTH_PWM, play_stealth_tone, SPECIAL_MODE_DURATION)
-                    elif input_code == BURGLAR_CODE:
-                        handle_special_mode("Burglar Alert", 30, play_burglar_alarm, SPECIAL_MODE_DURATION)
-                    elif input_code == TRAP_CODE:
-                        handle_special_mode("Trap", 30, play_trap_tone, SPECIAL_MODE_DURATION)
-                    elif input_code == PANIC_CODE: # [NEW] 무음 패닉 모드 (1125)
-                        # 이전에 활성화된 패닉 모드가 없다면 새로 시작
-                        if not is_panic_mode:
-                            panic_thread = threading.Thread(target=silent_panic_sequence)
-                            panic_thread.start()
-                        else:
-                            print("--- [SILENT PANIC] 이미 패닉 모드가 활성화되어 있습니다. ---")
-                            
-                    # 5. 실패 처리 (새로운 락다운 로직 적용)
-                    else:
-                        failed_attempts += 1
-                        print(f"실패 횟수: {failed_attempts} / {FAILURE_LIMIT}")
-                        if failed_attempts >= FAILURE_LIMIT:
-                            handle_lockdown_mode() # 5회 실패 시 락다운 실행
-                        else:
-                            password_fail_sequence(input_code)
-                            
-                    input_code = ""
-                    
-                elif key == '8': # 초기화 역할
-                    print("입력 초기화.")
-                    input_code = ""
-                    
-                elif key.isdigit() and len(input_code) < 4: # 숫자 키 입력 (4자리까지 허용)
-                    input_code += key
-                    print(f"입력 중: {input_code}")
+        # 5. 실패 처리 (새로운 락다운 로직 적용)
+        else:
+            failed_attempts += 1
+            print(f"실패 횟수: {failed_attempts} / {FAILURE_LIMIT}")
+            if failed_attempts >= FAILURE_LIMIT:
+                # 5회 실패 시 락다운 실행 (락다운 중 입력은 KEY_POLICIES에 따라 버려짐)
+                CONTROLLER.start_sequence("lockdown", handle_lockdown_mode())
+            else:
+                CONTROLLER.start_sequence("fail", password_fail_sequence(input_code))
                 
-            time.sleep(0.01)
+        input_code = ""
+        
+    elif key == '8': # 초기화 역할
+        if is_door_open and not input_code:
+            # [NEW] 문이 열린 상태에서 입력 없이 8을 누르면 자동 잠김을 기다리지 않고 바로 잠금
+            print("잠금 명령: 문을 바로 잠급니다.")
+            lock_door()
+        else:
+            print("입력 초기화.")
+        input_code = ""
+        
+    elif key.isdigit() and len(input_code) < 4: # 숫자 키 입력 (4자리까지 허용)
+        input_code += key
+        print(f"입력 중: {input_code}")
+
+# [NEW] 키 입력과 모든 효과를 하나의 이벤트 루프에서 처리하는 컨트롤러
+CONTROLLER = DoorlockController(KEY_QUEUE, handle_key, CLOCK, SCHEDULER)
+
+async def startup():
+    """시작 시 부저 테스트 후 초기 LED 상태 명확화 (빨간불 켜짐)"""
+    await test_buzzer()
+    lock_door()
+
+
+# ==================== 메인 루프 ====================
+if __name__ == "__main__":
+    print(f"--- 도어락 시스템 시작 (일반 비밀번호: {SECRET_CODE}, {FAILURE_LIMIT}회 실패 시 {LOCKDOWN_DURATION}초 락다운) ---")
+    
+    try:
+        asyncio.run(CONTROLLER.run(startup()))
 
     except KeyboardInterrupt:
         # 프로그램 종료 시 모든 장치를 안전하게 멈추고 GPIO 정리
+        if keypad_interrupt is not None:
+            keypad_interrupt.stop()
+        keypad.stop()
+        keypad.join(1)
+        if keypad_bank is not None:
+            keypad_bank.close()
+        if keypad_registers is not None:
+            keypad_registers.close()
+        print(f"키 입력 통계: {KEY_QUEUE.stats()}")
+        print(f"디바운스 통계: {KEY_DEBOUNCER.stats()}")
+        if keypad_interrupt is None:
+            print(f"적응형 폴링 통계: {KEYPAD_POLL_SCHEDULE.stats()}")
+        print(f"타이머 스케줄러 통계: {SCHEDULER.stats()}")
         motor_pwm.stop()
         buzzer_pwm.stop()
         GPIO.output(RED_PIN, False)
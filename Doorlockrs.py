@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+from gpio_backend import get_gpio # [NEW] GPIO 백엔드 선택 (RPi.GPIO / libgpiod / 시뮬레이터)
 import time
 import threading # 부저와 LED/모터 동작을 동시에 처리하기 위해 threading 모듈 사용
 
@@ -118,6 +118,7 @@ ALARM_LOW = 300
 ALARM_TIME = 0.1 
 
 # ==================== GPIO 초기화 ====================
+GPIO = get_gpio() # [NEW] DOORLOCK_GPIO_BACKEND 환경 변수로 백엔드 선택 (기본: auto)
 GPIO.setmode(GPIO.BCM)
 GPIO.setwarnings(False)
 
@@ -0,0 +1,89 @@
+"""
+시계(시간/대기) 모듈
+
+도어락의 모든 시간 계산(락다운, 패닉, 특수 모드, 자동 잠김)은 time.time()/time.sleep()
+대신 이 모듈의 시계 객체를 사용합니다.
+    CLOCK = get_clock()
+    CLOCK.time()     # 현재 시각 (초)
+    CLOCK.sleep(0.5) # 0.5초 대기
+    await CLOCK.asleep(0.5) # asyncio 코루틴 안에서 0.5초 대기
+
+DOORLOCK_TIME_WARP 환경 변수에 배속(예: 1000)을 주면 가상 시계(WarpClock)를 사용하여
+15초 락다운 같은 시나리오를 테스트/벤치마크에서 수 밀리초 만에 끝낼 수 있습니다.
+"""
+import asyncio
+import os
+import time
+
+TIME_WARP_ENV = "DOORLOCK_TIME_WARP"
+
+
+class RealClock:
+    """[NEW] 실제 시계 (time 모듈 그대로 사용)"""
+
+    speed = 1.0
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def asleep(self, seconds):
+        """asyncio용 대기 (이벤트 루프를 막지 않음)"""
+        await asyncio.sleep(max(0, self.to_real(seconds)))
+
+    def to_real(self, seconds):
+        """가상 시간(초)을 실제 대기 시간(초)으로 변환 (Event.wait 등의 timeout 계산용)"""
+        return seconds
+
+
+class WarpClock(RealClock):
+    """[NEW] 가상 시계: 실제 시간보다 speed배 빠르게 흐름
+
+    여러 스레드가 동시에 sleep해도 모두 같은 배속으로 흐르므로
+    부저/LED 스레드가 섞인 시나리오도 그대로 빠르게 재생됩니다.
+    """
+
+    def __init__(self, speed, start_time=None):
+        if speed <= 0:
+            raise ValueError("speed must be greater than 0")
+        self.speed = float(speed)
+        self.real_start = time.monotonic()
+        self.virtual_start = time.time() if start_time is None else start_time
+
+    def monotonic(self):
+        return (time.monotonic() - self.real_start) * self.speed
+
+    def time(self):
+        return self.virtual_start + self.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds / self.speed)
+
+    def to_real(self, seconds):
+        return seconds / self.speed
+
+
+_clock = None # 프로세스당 시계 1개
+
+
+def get_clock():
+    """[NEW] 사용할 시계 객체를 반환 (DOORLOCK_TIME_WARP가 있으면 가상 시계)"""
+    global _clock
+    if _clock is None:
+        speed = float(os.environ.get(TIME_WARP_ENV, "1"))
+        _clock = RealClock() if speed == 1 else WarpClock(speed)
+    return _clock
+
+
+def set_clock(clock):
+    """[NEW] 시계 교체 (테스트에서 모듈을 import 하기 전에 호출)"""
+    global _clock
+    _clock = clock
+    return clock
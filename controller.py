@@ -0,0 +1,173 @@
+"""
+도어락 asyncio 컨트롤러
+
+키 입력 처리, LED 깜빡임, 모터 구동, 부저 연주, 타이머를 모두 하나의
+asyncio 이벤트 루프(스레드 1개)에서 코루틴/태스크로 실행합니다.
+효과마다 스레드를 만들지 않으므로 타이머가 많아도 부담이 적고,
+긴 시퀀스(문 열림, 특수 모드, 락다운) 중에도 키 입력은 계속 받습니다.
+
+- 시퀀스(sequence): 문 열림/특수 모드처럼 한 번에 하나만 실행되는 긴 동작.
+  실행되는 동안 KeyQueue 상태를 바꿔서 키 정책(보관/버림/선점)을 적용합니다.
+- 효과(effect): 키 입력음, 패닉 펄스처럼 시퀀스와 따로 도는 백그라운드 태스크.
+- 타이머(timer): 자동 잠김처럼 일정 시간 뒤 실행되는 이름 붙은 콜백.
+  같은 이름으로 다시 설정하면 연장되고, 언제든 취소할 수 있습니다.
+  모든 타이머는 TimerScheduler 하나에 등록되며, 컨트롤러가 스케줄러 태스크도 함께 실행합니다.
+"""
+import asyncio
+
+from clock import get_clock
+from scheduler import TimerScheduler
+
+IDLE_STATE = "idle"
+
+
+class DoorlockController:
+    """[NEW] 키 입력과 모든 효과를 하나의 이벤트 루프에서 처리하는 컨트롤러"""
+
+    def __init__(self, key_queue, key_handler, clock=None, scheduler=None):
+        self.key_queue = key_queue
+        self.key_handler = key_handler # async def handler(key): 키 1개 처리
+        self.clock = clock if clock is not None else get_clock()
+        self.scheduler = scheduler if scheduler is not None else TimerScheduler(self.clock)
+        self.scheduler_task = None
+        self.loop = None
+        self.key_ready = None # 입력 스레드가 키를 넣으면 set
+        self.sequence_task = None
+        self.sequence_state = IDLE_STATE
+        self.effect_tasks = set()
+        self.timers = {} # 이름 -> (ScheduledTimer, 콜백)
+
+    async def run(self, startup=None):
+        """이벤트 루프에서 컨트롤러 실행 (startup 코루틴을 먼저 실행한 뒤 키 처리 시작)"""
+        self.loop = asyncio.get_running_loop()
+        self.key_ready = asyncio.Event()
+        self.key_queue.add_listener(self._on_key_pushed)
+        self.scheduler_task = asyncio.create_task(self.scheduler.run())
+        try:
+            if startup is not None:
+                await startup
+            self.key_ready.set() # 시작 전에 들어온 키도 처리
+            await self._key_loop()
+        finally:
+            self.key_queue.remove_listener(self._on_key_pushed)
+            await self.shutdown()
+            self.scheduler_task.cancel()
+            await asyncio.wait([self.scheduler_task])
+
+    def _on_key_pushed(self):
+        """입력 스레드에서 호출됨: 이벤트 루프를 깨우기만 함"""
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.key_ready.set)
+
+    async def _key_loop(self):
+        while True:
+            await self.key_ready.wait()
+            self.key_ready.clear()
+            await self._drain_keys()
+
+    async def _drain_keys(self):
+        while True:
+            if self.is_busy():
+                # 선점 정책 상태에서 키가 들어왔으면 시퀀스를 취소하고 키 처리,
+                # 보관 정책이면 시퀀스가 끝난 뒤 다시 처리
+                if not self.key_queue.preempt_event.is_set():
+                    return
+                await self.cancel_sequence()
+
+            event = self.key_queue.get()
+            if event is None:
+                return
+            await self.key_handler(event.key)
+
+    # -------------------- 시퀀스 --------------------
+    def is_busy(self):
+        """실행 중인 시퀀스가 있는지"""
+        return self.sequence_task is not None
+
+    def start_sequence(self, state, coro):
+        """시퀀스를 태스크로 시작 (즉시 반환). 끝날 때까지 state의 키 정책이 적용됨"""
+        if self.is_busy():
+            coro.close()
+            raise RuntimeError(f"이미 실행 중인 시퀀스가 있습니다: {self.sequence_state}")
+        self.sequence_state = state
+        self.key_queue.set_state(state)
+        self.sequence_task = asyncio.create_task(self._run_sequence(coro))
+        return self.sequence_task
+
+    async def _run_sequence(self, coro):
+        try:
+            await coro
+        except asyncio.CancelledError:
+            print(f"--- [{self.sequence_state.upper()}] 시퀀스가 중단되었습니다. ---")
+        except Exception as e:
+            print(f"시퀀스 실행 중 오류 발생: {e}")
+        finally:
+            self.sequence_task = None
+            self.sequence_state = IDLE_STATE
+            self.key_queue.set_state(IDLE_STATE)
+            self.key_ready.set() # 시퀀스 중 보관된 키 처리
+
+    async def cancel_sequence(self):
+        """실행 중인 시퀀스를 취소하고 정리(finally)가 끝날 때까지 대기"""
+        task = self.sequence_task
+        if task is None:
+            return
+        task.cancel()
+        await asyncio.wait([task])
+
+    # -------------------- 효과 --------------------
+    def spawn(self, coro):
+        """백그라운드 효과 태스크 시작 (시퀀스와 별개로 실행)"""
+        task = asyncio.create_task(coro)
+        self.effect_tasks.add(task)
+        task.add_done_callback(self._effect_done)
+        return task
+
+    def _effect_done(self, task):
+        self.effect_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"효과 실행 중 오류 발생: {task.exception()}")
+
+    # -------------------- 타이머 --------------------
+    def set_timer(self, name, delay, callback):
+        """delay초 뒤 callback() 실행. 같은 이름의 타이머가 있으면 새 시간으로 교체(연장)"""
+        self.cancel_timer(name)
+        timer = self.scheduler.call_later(delay, self._fire_timer, name, name=name)
+        self.timers[name] = (timer, callback)
+        return timer
+
+    def extend_timer(self, name, delay):
+        """실행 대기 중인 타이머를 지금부터 delay초 뒤로 연장 (타이머가 없으면 False)"""
+        if name not in self.timers:
+            return False
+        self.set_timer(name, delay, self.timers[name][1])
+        return True
+
+    def cancel_timer(self, name):
+        """타이머 취소 (취소한 타이머가 있으면 True)"""
+        timer = self.timers.pop(name, None)
+        if timer is None:
+            return False
+        timer[0].cancel()
+        return True
+
+    def timer_remaining(self, name):
+        """타이머 만료까지 남은 시간(초), 타이머가 없으면 None"""
+        if name not in self.timers:
+            return None
+        return max(0.0, self.timers[name][0].deadline - self.scheduler.now())
+
+    def _fire_timer(self, name):
+        _, callback = self.timers.pop(name)
+        callback()
+
+    async def shutdown(self):
+        """모든 시퀀스/효과 태스크와 타이머 취소"""
+        for name in list(self.timers):
+            self.cancel_timer(name)
+        await self.cancel_sequence()
+        tasks = list(self.effect_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
@@ -0,0 +1,451 @@
+"""
+GPIO/PWM 백엔드 모듈
+
+모든 도어락 스크립트는 RPi.GPIO 모듈과 같은 모양의 GPIO 객체를 사용합니다.
+    GPIO = get_gpio()
+    GPIO.setup(RED_PIN, GPIO.OUT)
+    GPIO.output(RED_PIN, True)
+    pwm = GPIO.PWM(BUZZER_PIN, 1)
+
+백엔드는 DOORLOCK_GPIO_BACKEND 환경 변수로 고를 수 있습니다.
+    rpi  : RPi.GPIO (라즈베리파이 기본)
+    gpiod: libgpiod 캐릭터 디바이스 (/dev/gpiochipN, 라즈베리파이 5 등)
+    sim  : 메모리 시뮬레이터 (일반 리눅스 PC/CI에서 실행, 테스트/벤치마크용)
+    auto : rpi -> gpiod -> sim 순서로 사용 가능한 것을 선택 (기본값)
+"""
+import os
+import select
+import threading
+import time
+
+GPIO_BACKEND_ENV = "DOORLOCK_GPIO_BACKEND"
+GPIOD_CHIP_ENV = "DOORLOCK_GPIOD_CHIP"
+GPIOD_CHIP_PATH = "/dev/gpiochip0"
+GPIOD_CONSUMER = "doorlock"
+
+
+class GpioBackend:
+    """[NEW] GPIO 백엔드 공통 인터페이스 (RPi.GPIO와 같은 상수/함수 이름 사용)"""
+
+    # RPi.GPIO와 같은 상수 값
+    BOARD = 10
+    BCM = 11
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+
+    name = "base"
+
+    def setmode(self, mode):
+        raise NotImplementedError
+
+    def setwarnings(self, flag):
+        raise NotImplementedError
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        raise NotImplementedError
+
+    def input(self, pin):
+        raise NotImplementedError
+
+    def output(self, pin, value):
+        raise NotImplementedError
+
+    def PWM(self, pin, frequency):
+        """ChangeDutyCycle/ChangeFrequency/start/stop을 가진 PWM 객체 반환"""
+        raise NotImplementedError
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        raise NotImplementedError
+
+    def remove_event_detect(self, pin):
+        raise NotImplementedError
+
+    def cleanup(self, pin=None):
+        raise NotImplementedError
+
+
+class RPiGpioBackend(GpioBackend):
+    """[NEW] RPi.GPIO 백엔드 (함수를 그대로 연결하므로 추가 호출 비용 없음)"""
+
+    name = "rpi"
+
+    def __init__(self):
+        import RPi.GPIO as rpi_gpio
+        self.module = rpi_gpio
+        for attr in ("BOARD", "BCM", "OUT", "IN", "LOW", "HIGH", "PUD_OFF", "PUD_DOWN",
+                     "PUD_UP", "RISING", "FALLING", "BOTH"):
+            setattr(self, attr, getattr(rpi_gpio, attr))
+        self.setmode = rpi_gpio.setmode
+        self.setwarnings = rpi_gpio.setwarnings
+        self.setup = rpi_gpio.setup
+        self.input = rpi_gpio.input
+        self.output = rpi_gpio.output
+        self.PWM = rpi_gpio.PWM
+        self.add_event_detect = rpi_gpio.add_event_detect
+        self.remove_event_detect = rpi_gpio.remove_event_detect
+        self.cleanup = rpi_gpio.cleanup
+
+
+class SoftwarePwm:
+    """[NEW] 출력 함수를 주기적으로 켜고 끄는 소프트웨어 PWM (gpiod 백엔드용)"""
+
+    def __init__(self, write_fn, frequency):
+        if frequency <= 0:
+            raise ValueError("frequency must be greater than 0.0")
+        self.write_fn = write_fn
+        self.frequency = frequency
+        self.duty_cycle = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self, duty_cycle):
+        self.duty_cycle = duty_cycle
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def ChangeDutyCycle(self, duty_cycle):
+        if not 0 <= duty_cycle <= 100:
+            raise ValueError("dutycycle must have a value from 0.0 to 100.0")
+        self.duty_cycle = duty_cycle
+
+    def ChangeFrequency(self, frequency):
+        if frequency <= 0:
+            raise ValueError("frequency must be greater than 0.0")
+        self.frequency = frequency
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.write_fn(False)
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            period = 1.0 / self.frequency
+            on_time = period * self.duty_cycle / 100.0
+            if on_time > 0:
+                self.write_fn(True)
+                time.sleep(on_time)
+            if period - on_time > 0:
+                self.write_fn(False)
+                time.sleep(period - on_time)
+
+
+class GpiodBackend(GpioBackend):
+    """[NEW] libgpiod (v2 파이썬 바인딩) 캐릭터 디바이스 백엔드
+
+    핀마다 라인 요청을 하나씩 만들고, 엣지 감지는 전용 스레드 1개가
+    모든 요청의 파일 디스크립터를 select로 기다렸다가 콜백을 호출합니다.
+    PWM은 소프트웨어 PWM(SoftwarePwm)으로 만듭니다.
+    """
+
+    name = "gpiod"
+
+    def __init__(self, chip_path=None):
+        import gpiod
+        from gpiod.line import Bias, Direction, Edge, Value
+        self.gpiod = gpiod
+        self.Bias = Bias
+        self.Direction = Direction
+        self.Edge = Edge
+        self.Value = Value
+        self.chip_path = chip_path or os.environ.get(GPIOD_CHIP_ENV, GPIOD_CHIP_PATH)
+        if not os.path.exists(self.chip_path):
+            raise OSError(f"GPIO 칩 디바이스가 없습니다: {self.chip_path}")
+        self.requests = {}  # pin -> LineRequest
+        self.settings = {}  # pin -> LineSettings
+        self.callbacks = {} # pin -> (callback, bouncetime(s), 마지막 이벤트 시각)
+        self.event_lock = threading.Lock()
+        self.event_thread = None
+        self.event_stop = threading.Event()
+
+    def setmode(self, mode):
+        if mode != self.BCM:
+            raise ValueError("gpiod 백엔드는 BCM(라인 오프셋) 번호만 지원합니다.")
+
+    def setwarnings(self, flag):
+        pass
+
+    def _bias(self, pull_up_down):
+        if pull_up_down == self.PUD_DOWN:
+            return self.Bias.PULL_DOWN
+        if pull_up_down == self.PUD_UP:
+            return self.Bias.PULL_UP
+        return self.Bias.AS_IS
+
+    def _request(self, pin, settings):
+        if pin in self.requests:
+            self.requests[pin].reconfigure_lines({pin: settings})
+        else:
+            self.requests[pin] = self.gpiod.request_lines(
+                self.chip_path, consumer=GPIOD_CONSUMER, config={pin: settings})
+        self.settings[pin] = settings
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        if direction == self.OUT:
+            value = self.Value.ACTIVE if initial else self.Value.INACTIVE
+            settings = self.gpiod.LineSettings(direction=self.Direction.OUTPUT, output_value=value)
+        else:
+            settings = self.gpiod.LineSettings(direction=self.Direction.INPUT,
+                                               bias=self._bias(pull_up_down))
+        self._request(pin, settings)
+
+    def input(self, pin):
+        return self.HIGH if self.requests[pin].get_value(pin) == self.Value.ACTIVE else self.LOW
+
+    def output(self, pin, value):
+        self.requests[pin].set_value(pin, self.Value.ACTIVE if value else self.Value.INACTIVE)
+
+    def PWM(self, pin, frequency):
+        return SoftwarePwm(lambda value: self.output(pin, value), frequency)
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        edge_map = {self.RISING: self.Edge.RISING, self.FALLING: self.Edge.FALLING,
+                    self.BOTH: self.Edge.BOTH}
+        settings = self.settings[pin]
+        self._request(pin, self.gpiod.LineSettings(direction=self.Direction.INPUT,
+                                                   bias=settings.bias,
+                                                   edge_detection=edge_map[edge]))
+        with self.event_lock:
+            self.callbacks[pin] = [callback, (bouncetime or 0) / 1000.0, None]
+        if self.event_thread is None:
+            self.event_stop.clear()
+            self.event_thread = threading.Thread(target=self._event_loop, daemon=True)
+            self.event_thread.start()
+
+    def remove_event_detect(self, pin):
+        with self.event_lock:
+            self.callbacks.pop(pin, None)
+        settings = self.settings.get(pin)
+        if settings is not None:
+            self._request(pin, self.gpiod.LineSettings(direction=self.Direction.INPUT,
+                                                       bias=settings.bias))
+
+    def _event_loop(self):
+        while not self.event_stop.is_set():
+            with self.event_lock:
+                watched = {self.requests[pin].fd: self.requests[pin] for pin in self.callbacks}
+            if not watched:
+                self.event_stop.wait(0.1)
+                continue
+            readable, _, _ = select.select(list(watched), [], [], 0.1)
+            for fd in readable:
+                for event in watched[fd].read_edge_events():
+                    self._dispatch(event.line_offset, event.timestamp_ns / 1e9)
+
+    def _dispatch(self, pin, timestamp):
+        with self.event_lock:
+            entry = self.callbacks.get(pin)
+            if entry is None:
+                return
+            callback, bouncetime, last_time = entry
+            if last_time is not None and timestamp - last_time < bouncetime:
+                return
+            entry[2] = timestamp
+        if callback is not None:
+            callback(pin)
+
+    def cleanup(self, pin=None):
+        pins = [pin] if pin is not None else list(self.requests)
+        for p in pins:
+            self.callbacks.pop(p, None)
+            request = self.requests.pop(p, None)
+            if request is not None:
+                request.release()
+            self.settings.pop(p, None)
+        if not self.requests and self.event_thread is not None:
+            self.event_stop.set()
+            self.event_thread.join()
+            self.event_thread = None
+
+
+class SimPwm:
+    """[NEW] 시뮬레이터 PWM 채널 (듀티/주파수 변경 이력을 기록)"""
+
+    def __init__(self, backend, pin, frequency):
+        if frequency <= 0:
+            raise ValueError("frequency must be greater than 0.0")
+        self.backend = backend
+        self.pin = pin
+        self.frequency = frequency
+        self.duty_cycle = 0
+        self.running = False
+        self.history = [] # (시각, "duty"/"freq", 값)
+
+    def _record(self, kind, value):
+        self.history.append((time.monotonic(), kind, value))
+        self.backend.write_count += 1
+
+    def start(self, duty_cycle):
+        self.running = True
+        self.duty_cycle = duty_cycle
+        self._record("duty", duty_cycle)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        if not 0 <= duty_cycle <= 100:
+            raise ValueError("dutycycle must have a value from 0.0 to 100.0")
+        self.duty_cycle = duty_cycle
+        self._record("duty", duty_cycle)
+
+    def ChangeFrequency(self, frequency):
+        if frequency <= 0:
+            raise ValueError("frequency must be greater than 0.0")
+        self.frequency = frequency
+        self._record("freq", frequency)
+
+    def stop(self):
+        self.running = False
+        self.duty_cycle = 0
+        self._record("duty", 0)
+
+
+class SimGpioBackend(GpioBackend):
+    """[NEW] 메모리 GPIO 시뮬레이터 (하드웨어 없이 실행/테스트/벤치마크)
+
+    입력 핀은 set_input()으로 값을 바꾸며, 등록된 엣지 콜백은
+    set_input()을 호출한 스레드에서 바로 (결정적으로) 호출됩니다.
+    """
+
+    name = "sim"
+
+    def __init__(self):
+        self.mode = None
+        self.directions = {} # pin -> IN/OUT
+        self.levels = {}     # pin -> 0/1
+        self.callbacks = {}  # pin -> (edge, callback, bouncetime(s), 마지막 이벤트 시각)
+        self.pwms = {}       # pin -> SimPwm
+        self.output_log = [] # (시각, pin, 값)
+        self.write_count = 0
+        self.lock = threading.RLock()
+        self.registers = None # [NEW] attach_registers()로 붙인 가짜 GPIO 레지스터 파일
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, pin, direction, pull_up_down=None, initial=None):
+        with self.lock:
+            self.directions[pin] = direction
+            if direction == self.OUT:
+                self.levels[pin] = 1 if initial else 0
+            else:
+                self.levels[pin] = 1 if pull_up_down == self.PUD_UP else 0
+
+    def input(self, pin):
+        if pin not in self.directions:
+            raise RuntimeError("You must setup() the GPIO channel first")
+        return self.levels[pin]
+
+    def output(self, pin, value):
+        if self.directions.get(pin) != self.OUT:
+            raise RuntimeError("The GPIO channel has not been set up as an OUTPUT")
+        with self.lock:
+            self.levels[pin] = 1 if value else 0
+            self.output_log.append((time.monotonic(), pin, self.levels[pin]))
+            self.write_count += 1
+
+    def PWM(self, pin, frequency):
+        pwm = SimPwm(self, pin, frequency)
+        self.pwms[pin] = pwm
+        return pwm
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        if self.directions.get(pin) != self.IN:
+            raise RuntimeError("You must setup() the GPIO channel as an input first")
+        with self.lock:
+            if pin in self.callbacks:
+                raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+            self.callbacks[pin] = [edge, callback, (bouncetime or 0) / 1000.0, None]
+
+    def remove_event_detect(self, pin):
+        with self.lock:
+            self.callbacks.pop(pin, None)
+
+    def attach_registers(self, registers):
+        """[NEW][시뮬레이터 전용] 입력 핀 값을 가짜 GPLEV0 레지스터 파일(FakeGpioRegisters)에도 기록
+
+        GpioMemBank(path=registers.path)가 실제 /dev/gpiomem 대신 시뮬레이터 핀 값을 읽게 됩니다.
+        """
+        with self.lock:
+            self.registers = registers
+            for pin, level in self.levels.items():
+                if 0 <= pin <= 31:
+                    registers.set_level(pin, level)
+        return registers
+
+    def set_input(self, pin, level):
+        """[시뮬레이터 전용] 입력 핀 값을 바꾸고 해당하는 엣지 콜백 호출"""
+        level = 1 if level else 0
+        with self.lock:
+            prev_level = self.levels.get(pin, 0)
+            self.levels[pin] = level
+            if self.registers is not None and 0 <= pin <= 31:
+                self.registers.set_level(pin, level) # 콜백보다 먼저 기록 (인터럽트 후 레지스터를 읽으므로)
+            entry = self.callbacks.get(pin)
+            if entry is None or prev_level == level:
+                return
+            edge, callback, bouncetime, last_time = entry
+            if edge == self.RISING and not level:
+                return
+            if edge == self.FALLING and level:
+                return
+            now = time.monotonic()
+            if last_time is not None and now - last_time < bouncetime:
+                return
+            entry[3] = now
+        if callback is not None:
+            callback(pin)
+
+    def cleanup(self, pin=None):
+        with self.lock:
+            pins = [pin] if pin is not None else list(self.directions)
+            for p in pins:
+                self.directions.pop(p, None)
+                self.levels.pop(p, None)
+                self.callbacks.pop(p, None)
+                self.pwms.pop(p, None)
+
+
+BACKENDS = {
+    "rpi": RPiGpioBackend,
+    "gpiod": GpiodBackend,
+    "sim": SimGpioBackend,
+}
+
+_gpio = None # 프로세스당 백엔드 1개 (모든 모듈이 같은 GPIO 객체를 공유)
+
+
+def get_gpio(name=None):
+    """[NEW] 선택된 GPIO 백엔드 객체를 반환 (처음 호출 시 생성)"""
+    global _gpio
+    if _gpio is not None:
+        return _gpio
+
+    name = name or os.environ.get(GPIO_BACKEND_ENV, "auto")
+    if name == "auto":
+        for candidate in ("rpi", "gpiod"):
+            try:
+                _gpio = BACKENDS[candidate]()
+                return _gpio
+            except (ImportError, RuntimeError, OSError):
+                continue
+        print(f"[GPIO] RPi.GPIO/libgpiod를 사용할 수 없어 시뮬레이터로 실행합니다. ({GPIO_BACKEND_ENV}=sim)")
+        name = "sim"
+
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 GPIO 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    _gpio = BACKENDS[name]()
+    return _gpio
@@ -0,0 +1,72 @@
+"""
+지연/지속 시간 히스토그램 모듈
+
+키 떨림 지속 시간처럼 ms 단위로 쌓이는 값을 고정 구간 히스토그램에 기록하고,
+통계에는 p50/p99/최대 ms만 요약해서 내보냅니다.
+    histogram = BounceHistogram([1, 2, 5, 10])  # 구간 상한 (ms)
+    histogram.add(0.0032)                       # 초 단위로 1건 기록
+    {"count": histogram.total, **summarize(histogram)} # {"count": 1, "p50": 3.2, "p99": 3.2, "max": 3.2}
+
+- 백분위는 구간 상한이므로 최대값보다 클 수 있어 최대값으로 자릅니다.
+- 하나의 스레드(또는 이벤트 루프)에서 사용합니다.
+"""
+
+# 떨림 지속 시간 히스토그램 구간 (ms, 각 구간의 상한)
+BOUNCE_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50]
+
+
+class BounceHistogram:
+    """[NEW] 떨림(바운스) 지속 시간 히스토그램 (다른 지연/지속 시간에도 구간만 바꿔 사용)"""
+
+    def __init__(self, buckets_ms=BOUNCE_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1) # 마지막 칸은 최대 구간 초과
+        self.total = 0
+        self.max_ms = 0.0
+
+    def add(self, duration):
+        """떨림 지속 시간(초) 1건 기록"""
+        duration_ms = duration * 1000
+        idx = 0
+        while idx < len(self.buckets_ms) and duration_ms > self.buckets_ms[idx]:
+            idx += 1
+        self.counts[idx] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def merge(self, other):
+        for idx, count in enumerate(other.counts):
+            self.counts[idx] += count
+        self.total += other.total
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile_ms(self, ratio):
+        """기록된 떨림의 ratio(0~1) 비율이 끝나는 구간 상한(ms). 안정 시간 조정에 사용"""
+        if self.total == 0:
+            return 0.0
+        target = ratio * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets_ms[idx] if idx < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def as_dict(self):
+        result = {}
+        for idx, count in enumerate(self.counts):
+            if idx < len(self.buckets_ms):
+                result[f"<={self.buckets_ms[idx]}ms"] = count
+            else:
+                result[f">{self.buckets_ms[-1]}ms"] = count
+        return result
+
+
+def summarize(histogram, digits=3):
+    """[NEW] 통계용 요약 {"p50", "p99", "max"} (ms, 백분위는 최대값을 넘지 않게 자름)"""
+    max_ms = histogram.max_ms
+    return {
+        "p50": round(min(histogram.percentile_ms(0.5), max_ms), digits),
+        "p99": round(min(histogram.percentile_ms(0.99), max_ms), digits),
+        "max": round(max_ms, digits),
+    }
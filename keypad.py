@@ -0,0 +1,467 @@
+"""
+키패드 입력 모듈
+
+10ms 폴링 대신 GPIO 엣지 인터럽트(add_event_detect)로 키 눌림을 받아
+큐에 넣어줍니다. 메인 루프는 큐에서 키를 꺼내기만 하면 되므로
+아무도 키패드를 누르지 않을 때는 CPU를 거의 사용하지 않습니다.
+
+키 입력은 시간 정보가 붙은 KeyEvent로 KeyQueue(고정 크기 링 버퍼)에 쌓이며,
+현재 도어락 상태별 정책(버림/보관/선점)에 따라 처리됩니다.
+
+각 키에는 디바운스 상태 머신(KeyDebouncer)이 하나씩 붙어 있어서
+채터링(떨림)을 걸러낸 뒤 눌림/뗌 이벤트를 따로 만들어 내고,
+떨림 지속 시간 히스토그램으로 디바운스 시간을 조정할 수 있게 해줍니다.
+
+폴링 방식에서는 AdaptivePollSchedule이 입력이 없을 때는 느리게,
+키 입력이 시작되면 빠르게 샘플링 주기를 바꿔줍니다.
+
+GpioMemBank는 /dev/gpiomem을 mmap하여 GPIO 레벨 레지스터(GPLEV0)를
+한 번만 읽고, 비트 마스크로 모든 키 상태를 한꺼번에 풀어냅니다.
+(핀마다 GPIO.input()을 8번 호출하는 것보다 빠르고, 같은 순간의 값을 얻음)
+"""
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, deque, namedtuple
+
+from histogram import BounceHistogram
+
+KEY_QUEUE_SIZE = 16 # 키 큐 최대 보관 개수 (가득 차면 가장 오래된 입력부터 버림)
+
+# 상태별 키 처리 정책
+POLICY_BUFFER = "buffer"   # 큐에 보관했다가 메인 루프가 돌아오면 처리
+POLICY_DROP = "drop"       # 입력을 버리고 버린 사유를 기록
+POLICY_PREEMPT = "preempt" # 큐에 보관하고 진행 중인 동작에 중단을 요청
+
+# 키 입력 이벤트 (timestamp: time.monotonic() 기준 눌린 시각)
+KeyEvent = namedtuple("KeyEvent", ["key", "timestamp"])
+
+# 디바운스 방식
+DEBOUNCE_WINDOW = "window"         # 마지막 변화 이후 stable_time 동안 변화가 없으면 확정
+DEBOUNCE_INTEGRATOR = "integrator" # 샘플마다 +1/-1 누적하여 끝값에 도달하면 확정
+
+KEY_DEBOUNCE_TIME = 0.02 # 기본 안정 시간 (초)
+
+# 디바운스 이벤트 종류
+KEY_PRESS = "press"
+KEY_RELEASE = "release"
+
+# BCM283x GPIO 레지스터 (/dev/gpiomem은 GPIO 블록을 오프셋 0부터 매핑)
+GPIO_MEM_PATH = "/dev/gpiomem"
+GPIO_MEM_SIZE = 4096
+GPLEV0_OFFSET = 0x34 # GPIO 0~31번 핀 레벨 레지스터
+
+# 적응형 폴링 모드
+POLL_IDLE = "idle"     # 입력 없음: 느린 주기
+POLL_ACTIVE = "active" # 입력 중: 빠른 주기
+
+
+class KeyQueue:
+    """[NEW] 시간 정보가 붙은 키 입력 링 버퍼 (상태별 정책 및 버림 통계 포함)
+
+    get()은 기다리지 않으므로, 꺼내는 쪽은 add_listener()로 새 입력 통지를 받아 깨어납니다.
+    """
+
+    def __init__(self, maxlen=KEY_QUEUE_SIZE, policies=None, default_policy=POLICY_BUFFER):
+        self.maxlen = maxlen
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy
+        self.state = "idle"
+        self.events = deque()
+        self.lock = threading.Lock() # 입력 스레드(push)와 꺼내는 쪽(get) 사이 보호
+        # 선점 정책 상태에서 키가 들어오면 set 됨 (진행 중인 동작이 확인 후 중단)
+        self.preempt_event = threading.Event()
+        self.pushed_count = 0
+        self.drop_counts = Counter() # 버린 사유별 개수
+        self.listeners = [] # 키가 보관될 때마다 (입력 스레드에서) 호출되는 함수 목록
+
+    def add_listener(self, listener):
+        """키가 보관될 때 호출할 함수 등록 (예: 메인 루프를 깨우는 Event.set)"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def policy(self):
+        """현재 상태에 적용되는 키 처리 정책"""
+        with self.lock:
+            return self.policies.get(self.state, self.default_policy)
+
+    def set_state(self, state):
+        """현재 도어락 상태 변경 (이후 들어오는 키에 해당 상태의 정책 적용)"""
+        with self.lock:
+            self.state = state
+            self.preempt_event.clear()
+
+    def push(self, key, timestamp=None):
+        """키 입력 추가 (입력 스레드/인터럽트 콜백에서 호출). 보관되면 True 반환"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        with self.lock:
+            self.pushed_count += 1
+            policy = self.policies.get(self.state, self.default_policy)
+
+            if policy == POLICY_DROP:
+                self.drop_counts[f"state:{self.state}"] += 1
+                return False
+
+            # 링 버퍼: 가득 차면 가장 오래된 입력을 버림
+            if len(self.events) >= self.maxlen:
+                self.events.popleft()
+                self.drop_counts["overflow"] += 1
+
+            self.events.append(KeyEvent(key, timestamp))
+            if policy == POLICY_PREEMPT:
+                self.preempt_event.set()
+
+        for listener in self.listeners:
+            listener()
+        return True
+
+    def get(self):
+        """가장 오래된 KeyEvent를 꺼냄 (없으면 None, 기다리지 않음: 새 입력은 add_listener로 통지받음)"""
+        with self.lock:
+            if not self.events:
+                return None
+            return self.events.popleft()
+
+    def clear(self, reason="cleared"):
+        """쌓인 입력을 모두 버림 (버린 개수는 reason 사유로 기록)"""
+        with self.lock:
+            if self.events:
+                self.drop_counts[reason] += len(self.events)
+                self.events.clear()
+
+    def stats(self):
+        """입력/버림 통계 반환"""
+        with self.lock:
+            return {
+                "pushed": self.pushed_count,
+                "queued": len(self.events),
+                "dropped": sum(self.drop_counts.values()),
+                "drop_reasons": dict(self.drop_counts),
+            }
+
+
+class KeyDebouncer:
+    """[NEW] 키 1개의 디바운스 상태 머신 (시간 창 또는 적분기 방식)"""
+
+    def __init__(self, stable_time=KEY_DEBOUNCE_TIME, method=DEBOUNCE_WINDOW, sample_interval=0.001):
+        if method not in (DEBOUNCE_WINDOW, DEBOUNCE_INTEGRATOR):
+            raise ValueError(f"알 수 없는 디바운스 방식: {method}")
+        self.stable_time = stable_time
+        self.method = method
+        self.stable_level = 0 # 확정된 상태 (0: 뗌, 1: 눌림)
+        self.raw_level = 0    # 마지막으로 읽은 원시 값
+        self.first_change = None # 확정 상태에서 처음 벗어난 시각 (None이면 안정 상태)
+        self.last_change = None  # 마지막으로 원시 값이 바뀐 시각
+        # 적분기: 안정 시간을 샘플 개수로 환산
+        self.integrator_max = max(1, round(stable_time / sample_interval))
+        self.integrator = 0
+        self.event_time = None # 마지막 이벤트의 실제 (첫 엣지) 시각
+        self.glitch_count = 0  # 확정되지 못하고 원래 상태로 돌아간 잡음 횟수
+        self.histogram = BounceHistogram()
+
+    def is_settled(self):
+        return self.first_change is None
+
+    def update(self, level, now):
+        """원시 샘플 1개 입력. 상태가 확정되면 KEY_PRESS/KEY_RELEASE, 아니면 None 반환"""
+        level = 1 if level else 0
+
+        # 원시 값 변화 추적 (두 방식 공통, 히스토그램용)
+        if level != self.raw_level:
+            self.raw_level = level
+            if self.first_change is None:
+                self.first_change = now
+            self.last_change = now
+
+        if self.method == DEBOUNCE_INTEGRATOR:
+            if level:
+                self.integrator = min(self.integrator_max, self.integrator + 1)
+            else:
+                self.integrator = max(0, self.integrator - 1)
+            if self.integrator == self.integrator_max:
+                settled_level = 1
+            elif self.integrator == 0:
+                settled_level = 0
+            else:
+                return None
+        else:
+            if self.first_change is None or now - self.last_change < self.stable_time:
+                return None
+            settled_level = self.raw_level
+
+        if self.first_change is None:
+            return None
+
+        if settled_level == self.stable_level:
+            # 잠깐 튀었다가 원래 상태로 돌아온 잡음
+            self.glitch_count += 1
+            self.first_change = None
+            return None
+
+        self.stable_level = settled_level
+        self.event_time = self.first_change
+        self.histogram.add(self.last_change - self.first_change)
+        self.first_change = None
+        return KEY_PRESS if settled_level else KEY_RELEASE
+
+
+class KeypadDebouncer:
+    """[NEW] 키패드 전체 디바운서: 키마다 KeyDebouncer 1개, 눌림은 KeyQueue로 전달"""
+
+    def __init__(self, key_count, key_queue, stable_time=KEY_DEBOUNCE_TIME,
+                 method=DEBOUNCE_WINDOW, sample_interval=0.001, on_release=None):
+        self.key_queue = key_queue
+        self.on_release = on_release # 뗌 이벤트 콜백 (key, timestamp), 필요할 때만 지정
+        self.debouncers = [KeyDebouncer(stable_time, method, sample_interval)
+                           for _ in range(key_count)]
+        self.press_count = 0
+        self.release_count = 0
+
+    def update(self, levels, now=None):
+        """모든 키의 원시 샘플 입력. 확정된 (key, 이벤트 종류) 목록 반환"""
+        if now is None:
+            now = time.monotonic()
+        events = []
+        for idx, level in enumerate(levels):
+            debouncer = self.debouncers[idx]
+            kind = debouncer.update(level, now)
+            if kind is None:
+                continue
+            key = str(idx + 1)
+            events.append((key, kind))
+            if kind == KEY_PRESS:
+                self.press_count += 1
+                self.key_queue.push(key, debouncer.event_time)
+            else:
+                self.release_count += 1
+                if self.on_release is not None:
+                    self.on_release(key, debouncer.event_time)
+        return events
+
+    def is_settled(self):
+        """모든 키가 안정 상태인지 (떨림 확인 중인 키가 없는지)"""
+        return all(d.is_settled() for d in self.debouncers)
+
+    def histogram(self):
+        """모든 키의 떨림 히스토그램을 합친 결과"""
+        merged = BounceHistogram()
+        for debouncer in self.debouncers:
+            merged.merge(debouncer.histogram)
+        return merged
+
+    def stats(self):
+        merged = self.histogram()
+        return {
+            "presses": self.press_count,
+            "releases": self.release_count,
+            "glitches": sum(d.glitch_count for d in self.debouncers),
+            "bounce_histogram": merged.as_dict(),
+            "bounce_p99_ms": merged.percentile_ms(0.99),
+        }
+
+
+class AdaptivePollSchedule:
+    """[NEW] 적응형 키패드 샘플링 주기 (유휴 시 느리게, 입력 시작 시 빠르게)
+
+    첫 엣지가 감지되면 active_interval로 전환하고, 마지막 입력 후
+    idle_timeout 동안 아무 입력이 없으면 idle_interval로 돌아갑니다.
+    모드별로 평균 CPU 사용률과 샘플 간 최대 간격(= 최악 감지 지연)을 기록합니다.
+    """
+
+    def __init__(self, idle_interval=0.05, active_interval=0.002, idle_timeout=5.0):
+        self.idle_interval = idle_interval
+        self.active_interval = active_interval
+        self.idle_timeout = idle_timeout
+        self.mode = POLL_IDLE
+        self.last_activity = None
+        self.last_sample_time = None
+        self.last_cpu_time = None
+        self.mode_stats = {mode: {"samples": 0, "wall_time": 0.0, "cpu_time": 0.0, "max_gap": 0.0}
+                           for mode in (POLL_IDLE, POLL_ACTIVE)}
+
+    def on_sample(self, now, cpu_time):
+        """샘플 1회마다 호출: 직전 샘플 이후 구간을 그 동안의 모드에 기록"""
+        if self.last_sample_time is not None:
+            gap = now - self.last_sample_time
+            stats = self.mode_stats[self.mode]
+            stats["samples"] += 1
+            stats["wall_time"] += gap
+            stats["cpu_time"] += cpu_time - self.last_cpu_time
+            stats["max_gap"] = max(stats["max_gap"], gap)
+        self.last_sample_time = now
+        self.last_cpu_time = cpu_time
+
+    def next_interval(self, is_active, now):
+        """이번 샘플에서 입력 활동이 있었는지 알려주면 다음 샘플까지의 대기 시간을 반환"""
+        if is_active:
+            self.last_activity = now
+            self.mode = POLL_ACTIVE
+        elif self.mode == POLL_ACTIVE and now - self.last_activity >= self.idle_timeout:
+            self.mode = POLL_IDLE
+
+        if self.mode == POLL_ACTIVE:
+            return self.active_interval
+        return self.idle_interval
+
+    def stats(self):
+        """모드별 평균 CPU 사용률(%)과 최악 감지 지연(ms)"""
+        result = {}
+        for mode, stats in self.mode_stats.items():
+            wall_time = stats["wall_time"]
+            result[mode] = {
+                "samples": stats["samples"],
+                "time_s": round(wall_time, 3),
+                "cpu_percent": round(100 * stats["cpu_time"] / wall_time, 3) if wall_time else 0.0,
+                "worst_latency_ms": round(stats["max_gap"] * 1000, 3),
+            }
+        return result
+
+
+class GpioMemBank:
+    """[NEW] /dev/gpiomem mmap으로 GPLEV0 레지스터를 1회 읽어 여러 핀 레벨을 한 번에 얻음"""
+
+    def __init__(self, pins, path=GPIO_MEM_PATH):
+        self.pins = list(pins)
+        if any(pin < 0 or pin > 31 for pin in self.pins):
+            raise ValueError("GPLEV0 레지스터로는 0~31번 핀만 읽을 수 있습니다.")
+        fd = os.open(path, os.O_RDWR | os.O_SYNC)
+        try:
+            self.mem = mmap.mmap(fd, GPIO_MEM_SIZE, mmap.MAP_SHARED, mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        # 32비트 단위로 접근 (주변장치 레지스터는 바이트 단위로 읽으면 안 됨)
+        self.words = memoryview(self.mem).cast("I")
+        self.level_index = GPLEV0_OFFSET // 4
+
+    def read_word(self):
+        """GPLEV0 레지스터 값 (비트 n = n번 핀 레벨)"""
+        return self.words[self.level_index]
+
+    def read_levels(self):
+        """키패드 핀 순서대로 레벨 목록 반환 (레지스터 1회 읽기)"""
+        word = self.words[self.level_index]
+        return [(word >> pin) & 1 for pin in self.pins]
+
+    def close(self):
+        self.words.release()
+        self.mem.close()
+
+
+class FakeGpioRegisters:
+    """[NEW] 테스트용 가짜 GPIO 레지스터 파일 (GpioMemBank의 path로 사용)"""
+
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix="fake_gpiomem_")
+        os.write(fd, bytes(GPIO_MEM_SIZE))
+        os.close(fd)
+        self.level_word = 0
+
+    def set_level(self, pin, level):
+        """pin의 레벨을 바꾸고 파일의 GPLEV0 위치에 기록"""
+        if level:
+            self.level_word |= 1 << pin
+        else:
+            self.level_word &= ~(1 << pin)
+        with open(self.path, "r+b") as f:
+            f.seek(GPLEV0_OFFSET)
+            f.write(self.level_word.to_bytes(4, "little"))
+
+    def close(self):
+        os.remove(self.path)
+
+
+class InterruptKeypad:
+    """[NEW] GPIO.add_event_detect 기반 키패드 입력 (엣지 트리거)
+
+    엣지(눌림/뗌 모두)가 들어오면 wake_event를 깨워서 입력 스레드가
+    디바운스가 끝날 때까지만 짧게 샘플링하도록 합니다.
+    """
+
+    def __init__(self, gpio, pins, wake_event):
+        self.gpio = gpio
+        self.pins = list(pins)
+        self.wake_event = wake_event
+        self.is_running = False
+
+    def start(self):
+        """모든 키패드 핀에 양방향 엣지(눌림/뗌) 인터럽트 등록"""
+        try:
+            for pin in self.pins:
+                self.gpio.add_event_detect(pin, self.gpio.BOTH,
+                                           callback=self._on_edge)
+        except RuntimeError:
+            # 일부 커널에서는 엣지 감지 등록이 실패하므로 등록한 핀을 되돌리고 호출자에게 알림
+            self.stop()
+            raise
+        self.is_running = True
+
+    def stop(self):
+        """등록된 인터럽트 해제"""
+        for pin in self.pins:
+            try:
+                self.gpio.remove_event_detect(pin)
+            except RuntimeError:
+                pass
+        self.is_running = False
+
+    def _on_edge(self, channel):
+        """인터럽트 콜백 (GPIO 라이브러리 스레드에서 호출됨): 입력 스레드만 깨움"""
+        self.wake_event.set()
+
+
+class KeyInputThread(threading.Thread):
+    """[NEW] 키패드를 샘플링하여 디바운서에 전달하는 전용 입력 스레드
+
+    wake_event가 주어지면 (인터럽트 방식) 모든 키가 안정 상태일 때는
+    엣지 인터럽트가 올 때까지 잠들고, 떨림을 확인하는 동안에만
+    burst_interval 주기로 샘플링합니다. wake_event가 없으면 폴링하며,
+    interval에 AdaptivePollSchedule을 주면 입력 활동에 따라 주기를 바꿉니다.
+    """
+
+    def __init__(self, sample_fn, debouncer, interval, burst_interval=0.001, wake_event=None):
+        super().__init__(daemon=True)
+        self.sample_fn = sample_fn # 키패드 핀 레벨 목록을 반환하는 함수
+        self.debouncer = debouncer
+        self.interval = interval # 고정 주기(초) 또는 AdaptivePollSchedule
+        self.burst_interval = burst_interval
+        self.wake_event = wake_event
+        self.stop_event = threading.Event()
+
+    def run(self):
+        schedule = self.interval if isinstance(self.interval, AdaptivePollSchedule) else None
+        while not self.stop_event.is_set():
+            if self.wake_event is not None:
+                self.wake_event.clear()
+            now = time.monotonic()
+            if schedule is not None:
+                schedule.on_sample(now, time.thread_time())
+            levels = self.sample_fn()
+            self.debouncer.update(levels, now)
+
+            if self.wake_event is not None:
+                if self.debouncer.is_settled():
+                    # 모든 키 안정: 다음 엣지 인터럽트까지 대기
+                    self.wake_event.wait()
+                else:
+                    # 떨림 확인 중: 짧은 주기로 다시 샘플링
+                    self.stop_event.wait(self.burst_interval)
+            elif schedule is not None:
+                # 눌려 있는 키가 있거나 떨림 확인 중이면 입력 활동으로 간주
+                is_active = any(levels) or not self.debouncer.is_settled()
+                self.stop_event.wait(schedule.next_interval(is_active, now))
+            elif not self.debouncer.is_settled():
+                self.stop_event.wait(self.burst_interval)
+            else:
+                self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.wake_event is not None:
+            self.wake_event.set()
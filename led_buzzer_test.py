@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+from gpio_backend import get_gpio # [NEW] GPIO 백엔드 선택 (RPi.GPIO / libgpiod / 시뮬레이터)
 import time
 import math
 
@@ -28,6 +28,7 @@ FUR_ELISE_NOTES = [
 ]
 
 # ==================== GPIO 초기화 및 PWM 설정 (이전과 동일) ====================
+GPIO = get_gpio() # [NEW] DOORLOCK_GPIO_BACKEND 환경 변수로 백엔드 선택 (기본: auto)
 GPIO.setmode(GPIO.BCM)
 GPIO.setwarnings(False)
 
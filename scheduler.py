@@ -0,0 +1,192 @@
+"""
+타이머 스케줄러 모듈
+
+LED 깜빡임, 부저 연주, 모터 구동, 자동 잠김 등 모든 시간 동작이 각자
+sleep 하는 대신 하나의 스케줄러에 "언제 깨워 달라"는 만료 시각(deadline)을 등록합니다.
+    SCHEDULER = TimerScheduler(CLOCK)
+    timer = SCHEDULER.call_later(3.0, lock_door, name="relock") # 3초 뒤 콜백
+    timer.cancel()                                              # O(1) 취소
+    await SCHEDULER.sleep(0.5, name="blink")                    # 코루틴 대기
+
+- 만료 시각은 힙(heap)으로 관리하고, 가장 가까운 만료 시각에만 깨어납니다.
+- 취소는 표시만 하고(지연 삭제) 힙에서 꺼낼 때 건너뛰므로 O(1)입니다.
+- 타이머가 실제로 얼마나 늦게 실행됐는지(지연) 이름별 히스토그램으로 기록합니다.
+- Ticker는 "이전 만료 시각 + 간격"으로 다음 만료 시각을 정하므로
+  반복 깜빡임/멜로디가 sleep 누적 오차로 밀리지 않습니다.
+"""
+import asyncio
+import heapq
+import itertools
+
+from clock import get_clock
+from histogram import BounceHistogram, summarize
+
+LATENESS_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100] # 지연 히스토그램 구간 (실제 시간 ms)
+COMPACT_MIN_CANCELLED = 64 # 취소된 항목이 이 개수 이상이고 힙의 절반을 넘으면 힙 재구성
+
+
+class ScheduledTimer:
+    """[NEW] 스케줄러에 등록된 타이머 1개 (cancel()로 취소)"""
+
+    __slots__ = ("deadline", "callback", "args", "name", "cancelled", "done", "_scheduler")
+
+    def __init__(self, scheduler, deadline, callback, args, name):
+        self._scheduler = scheduler
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.name = name
+        self.cancelled = False
+        self.done = False # 실행되었거나 취소됨
+
+    def cancel(self):
+        """타이머 취소 (이미 실행/취소된 경우 무시)"""
+        if self.done:
+            return
+        self.done = True
+        self.cancelled = True
+        self._scheduler._on_cancel()
+
+
+class Ticker:
+    """[NEW] 누적 오차 없는 반복 대기 (만료 시각 = 시작 시각 + 지금까지 기다린 간격의 합)"""
+
+    def __init__(self, scheduler, name):
+        self.scheduler = scheduler
+        self.name = name
+        self.start = scheduler.now()
+        self.deadline = self.start
+
+    def elapsed(self):
+        """시작 후 예정된 경과 시간 (실제 깨어난 시각이 아닌 만료 시각 기준)"""
+        return self.deadline - self.start
+
+    async def wait(self, seconds):
+        """이전 만료 시각으로부터 seconds초 뒤까지 대기"""
+        self.deadline += max(0, seconds)
+        await self.scheduler.sleep_until(self.deadline, self.name)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class TimerScheduler:
+    """[NEW] 모든 만료 시각을 하나의 힙으로 관리하는 타이머 스케줄러 (run()을 태스크로 실행)"""
+
+    def __init__(self, clock=None, lateness_buckets_ms=LATENESS_BUCKETS_MS):
+        self.clock = clock if clock is not None else get_clock()
+        self.lateness_buckets_ms = lateness_buckets_ms
+        self._heap = [] # (만료 시각, 순번, 타이머)
+        self._seq = itertools.count() # 같은 만료 시각은 등록 순서대로
+        self._cancelled_in_heap = 0
+        self._wakeup = None # 더 이른 만료 시각이 등록되면 set
+        self.fired_count = 0
+        self.cancelled_count = 0
+        self.max_pending = 0
+        self.lateness = {} # 타이머 이름 -> 지연 히스토그램
+
+    def now(self):
+        """스케줄링 기준 시각 (단조 시계: 벽시계가 NTP 등으로 바뀌어도 만료 시각이 흔들리지 않음)"""
+        return self.clock.monotonic()
+
+    # -------------------- 등록/취소 --------------------
+    def call_at(self, deadline, callback, *args, name="timer"):
+        """deadline(now() 기준 단조 시각)에 callback(*args) 실행"""
+        timer = ScheduledTimer(self, deadline, callback, args, name)
+        heapq.heappush(self._heap, (deadline, next(self._seq), timer))
+        self.max_pending = max(self.max_pending, self.pending())
+        # 가장 이른 만료 시각이 바뀌었을 때만 스케줄러를 깨움
+        if self._heap[0][2] is timer and self._wakeup is not None:
+            self._wakeup.set()
+        return timer
+
+    def call_later(self, delay, callback, *args, name="timer"):
+        """delay초 뒤 callback(*args) 실행"""
+        return self.call_at(self.now() + max(0, delay), callback, *args, name=name)
+
+    def pending(self):
+        """실행 대기 중인 타이머 수"""
+        return len(self._heap) - self._cancelled_in_heap
+
+    def _on_cancel(self):
+        self.cancelled_count += 1
+        self._cancelled_in_heap += 1
+        # 취소된 항목이 너무 많이 쌓이면 힙을 재구성하여 메모리/탐색 비용 회수
+        if (self._cancelled_in_heap >= COMPACT_MIN_CANCELLED
+                and self._cancelled_in_heap * 2 > len(self._heap)):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled_in_heap = 0
+
+    # -------------------- 코루틴 대기 --------------------
+    async def sleep_until(self, deadline, name="sleep"):
+        """deadline까지 대기 (대기 중 태스크가 취소되면 타이머도 취소)"""
+        future = asyncio.get_running_loop().create_future()
+        timer = self.call_at(deadline, _resolve, future, name=name)
+        try:
+            await future
+        finally:
+            timer.cancel()
+
+    async def sleep(self, seconds, name="sleep"):
+        """지금부터 seconds초 대기"""
+        await self.sleep_until(self.now() + max(0, seconds), name)
+
+    def ticker(self, name):
+        """반복 대기용 Ticker 생성 (지금을 시작 시각으로 사용)"""
+        return Ticker(self, name)
+
+    # -------------------- 실행 --------------------
+    async def run(self):
+        """가장 가까운 만료 시각까지 잠들었다가 만료된 타이머를 실행 (취소될 때까지 반복)"""
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                self._fire_due()
+                self._wakeup.clear()
+                timeout = None
+                if self._heap:
+                    timeout = max(0, self.clock.to_real(self._heap[0][0] - self.now()))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+
+    def _fire_due(self):
+        now = self.now()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, timer = heapq.heappop(self._heap)
+            if timer.cancelled:
+                self._cancelled_in_heap -= 1
+                continue
+            timer.done = True
+            self.fired_count += 1
+            self._record_lateness(timer.name, now - timer.deadline)
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                print(f"타이머({timer.name}) 실행 중 오류 발생: {e}")
+
+    def _record_lateness(self, name, late):
+        histogram = self.lateness.get(name)
+        if histogram is None:
+            histogram = self.lateness[name] = BounceHistogram(self.lateness_buckets_ms)
+        # 가상 시계(배속)에서도 실제 지연 시간으로 기록
+        histogram.add(max(0.0, late) / self.clock.speed)
+
+    def stats(self):
+        """스케줄러 통계 (대기/실행/취소 수, 이름별 지연 p50/p99/최대 ms)"""
+        return {
+            "pending": self.pending(),
+            "max_pending": self.max_pending,
+            "fired": self.fired_count,
+            "cancelled": self.cancelled_count,
+            "lateness_ms": {
+                name: {"count": histogram.total, **summarize(histogram)}
+                for name, histogram in self.lateness.items()
+            },
+        }
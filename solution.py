@@ -1,4 +1,4 @@
-import RPi.GPIO as GPIO
+from gpio_backend import get_gpio # [NEW] GPIO 백엔드 선택 (RPi.GPIO / libgpiod / 시뮬레이터)
 import time
 
 # ==================== 전역 변수 및 핀 설정 ====================
@@ -35,6 +35,7 @@ FIRE_SIREN_LOW = 650
 FIRE_SIREN_TIME = 0.15  # 경고음 시간
 
 # ==================== GPIO 초기화 ====================
+GPIO = get_gpio() # [NEW] DOORLOCK_GPIO_BACKEND 환경 변수로 백엔드 선택 (기본: auto)
 GPIO.setmode(GPIO.BCM)
 GPIO.setwarnings(False)
 
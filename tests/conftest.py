@@ -0,0 +1,42 @@
+"""
+테스트 공통 설정
+
+모듈들은 저장소 최상위에 있으므로 경로에 추가하고, 하드웨어 없이 돌도록
+GPIO 백엔드를 시뮬레이터로 고정합니다.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DOORLOCK_GPIO_BACKEND", "sim")
+
+
+class ManualClock:
+    """손으로 진행시키는 시계 (advance()를 부를 때만 시간이 흐름)"""
+
+    speed = 1.0
+
+    def __init__(self, start=1000.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def to_real(self, seconds):
+        return seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def manual_clock():
+    return ManualClock()
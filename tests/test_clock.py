@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+import pytest
+
+import clock
+from clock import RealClock, WarpClock, get_clock
+
+
+# ==================== 가상 시계 (user-007) ====================
+
+def test_warp_clock_runs_faster_than_real_time():
+    warp = WarpClock(1000, start_time=0.0)
+    start = time.monotonic()
+    warp.sleep(2.0) # 실제로는 2ms
+    assert time.monotonic() - start < 0.5
+    assert warp.time() >= 2.0
+    assert warp.to_real(15.0) == pytest.approx(0.015)
+
+
+def test_warp_clock_async_sleep_uses_real_equivalent():
+    warp = WarpClock(1000)
+    start = time.monotonic()
+    asyncio.run(warp.asleep(1.0))
+    assert time.monotonic() - start < 0.5
+
+
+def test_warp_clock_rejects_non_positive_speed():
+    with pytest.raises(ValueError):
+        WarpClock(0)
+
+
+def test_get_clock_reads_time_warp_env(monkeypatch):
+    monkeypatch.setattr(clock, "_clock", None)
+    monkeypatch.setenv(clock.TIME_WARP_ENV, "250")
+    assert get_clock().speed == 250.0
+    monkeypatch.setattr(clock, "_clock", None)
+    monkeypatch.delenv(clock.TIME_WARP_ENV)
+    assert isinstance(get_clock(), RealClock) and get_clock().speed == 1.0
@@ -0,0 +1,124 @@
+import asyncio
+
+from clock import RealClock
+from controller import DoorlockController
+from keypad import POLICY_BUFFER, POLICY_DROP, POLICY_PREEMPT, KeyQueue
+
+
+def make_controller(policies):
+    handled = []
+
+    async def handle(key):
+        handled.append(key)
+
+    controller = DoorlockController(KeyQueue(policies=policies), handle, clock=RealClock())
+    return controller, handled
+
+
+def run_with(controller, scenario):
+    """컨트롤러를 실행한 채로 scenario() 코루틴을 돌리고 끝나면 컨트롤러 종료"""
+    async def main():
+        task = asyncio.create_task(controller.run())
+        await asyncio.sleep(0)
+        try:
+            await scenario()
+        finally:
+            task.cancel()
+            await asyncio.wait([task])
+    asyncio.run(main())
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0.001)
+
+
+# ==================== 키 정책 (user-008) ====================
+
+def test_buffered_keys_run_after_the_sequence_ends():
+    controller, handled = make_controller({"busy": POLICY_BUFFER})
+
+    async def scenario():
+        release = asyncio.Event()
+        controller.start_sequence("busy", release.wait())
+        controller.key_queue.push("1")
+        await settle()
+        assert handled == []
+        release.set()
+        await settle()
+        assert handled == ["1"]
+        assert not controller.is_busy()
+
+    run_with(controller, scenario)
+
+
+def test_dropped_keys_are_counted_not_handled():
+    controller, handled = make_controller({"busy": POLICY_DROP})
+
+    async def scenario():
+        controller.start_sequence("busy", asyncio.sleep(0.02))
+        assert controller.key_queue.push("2") is False
+        await asyncio.sleep(0.03)
+        assert handled == []
+        assert controller.key_queue.stats()["drop_reasons"] == {"state:busy": 1}
+
+    run_with(controller, scenario)
+
+
+def test_preempt_key_cancels_sequence_and_is_handled():
+    controller, handled = make_controller({"busy": POLICY_PREEMPT})
+    cancelled = []
+
+    async def sequence():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario():
+        controller.start_sequence("busy", sequence())
+        await settle()
+        controller.key_queue.push("3")
+        await settle()
+        assert cancelled == [True]
+        assert handled == ["3"]
+
+    run_with(controller, scenario)
+
+
+# ==================== 자동 잠김 타이머 (user-009) ====================
+
+def test_relock_timer_fires_without_blocking_keys():
+    controller, handled = make_controller({})
+    fired = []
+
+    async def scenario():
+        controller.set_timer("relock", 0.03, lambda: fired.append("relock"))
+        controller.key_queue.push("5") # 타이머 대기 중에도 키 처리
+        await settle()
+        assert handled == ["5"] and fired == []
+        assert 0 < controller.timer_remaining("relock") <= 0.03
+        await asyncio.sleep(0.05)
+        assert fired == ["relock"]
+        assert controller.timer_remaining("relock") is None
+
+    run_with(controller, scenario)
+
+
+def test_relock_timer_can_be_extended_and_cancelled():
+    controller, _ = make_controller({})
+    fired = []
+
+    async def scenario():
+        controller.set_timer("relock", 0.02, lambda: fired.append("relock"))
+        await asyncio.sleep(0.01)
+        assert controller.extend_timer("relock", 0.05)
+        await asyncio.sleep(0.03)
+        assert fired == [] # 처음 만료 시각은 지났지만 연장됨
+        assert controller.cancel_timer("relock")
+        await asyncio.sleep(0.05)
+        assert fired == []
+        assert not controller.extend_timer("relock", 0.01)
+
+    run_with(controller, scenario)
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from controller import DoorlockController
+from keypad import KeyQueue
+
+
+@pytest.fixture(scope="module")
+def doorlock():
+    """시뮬레이터 백엔드로 Doorlockrg를 불러오고 끝나면 키패드 입력 스레드와 가짜 레지스터 정리"""
+    import Doorlockrg
+    yield Doorlockrg
+    Doorlockrg.keypad.stop()
+    Doorlockrg.keypad.join(1)
+    if Doorlockrg.keypad_bank is not None:
+        Doorlockrg.keypad_bank.close()
+    if Doorlockrg.keypad_registers is not None:
+        Doorlockrg.keypad_registers.close()
+
+
+def run_mode(doorlock, state, mode_name, keys):
+    """Doorlockrg의 키 정책으로 특수 모드를 짧게 실행하고 도중에 keys를 누름. (완료 여부, 처리된 키) 반환"""
+    handled = []
+
+    async def handle(key):
+        handled.append(key)
+
+    async def quiet():
+        await asyncio.sleep(0)
+
+    controller = DoorlockController(KeyQueue(policies=doorlock.KEY_POLICIES), handle)
+
+    async def main():
+        runner = asyncio.create_task(controller.run())
+        await asyncio.sleep(0)
+        finished = []
+
+        async def mode():
+            await doorlock.handle_special_mode(mode_name, 0, quiet, 0.1)
+            finished.append(True)
+
+        task = controller.start_sequence(state, mode())
+        await asyncio.sleep(0.02)
+        for key in keys:
+            controller.key_queue.push(key)
+        await asyncio.wait([task])
+        await asyncio.sleep(0.01)
+        runner.cancel()
+        await asyncio.wait([runner])
+        return bool(finished)
+
+    return asyncio.run(main()), handled
+
+
+# ==================== 특수 모드 키 정책 (user-008) ====================
+
+def test_ordinary_key_does_not_end_emergency_mode(doorlock):
+    finished, handled = run_mode(doorlock, "special", "Ambulance", ["1"])
+    assert finished # 경보는 끝까지 울림
+    assert handled == ["1"] # 키는 보관했다가 경보가 끝난 뒤 처리
+
+
+def test_any_key_ends_cosmetic_mode(doorlock):
+    finished, handled = run_mode(doorlock, "cosmetic", "Disco Party", ["1"])
+    assert not finished
+    assert handled == ["1"]
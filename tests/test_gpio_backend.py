@@ -0,0 +1,45 @@
+import pytest
+
+import gpio_backend
+from gpio_backend import SimGpioBackend, get_gpio
+
+
+# ==================== GPIO 백엔드 (user-006) ====================
+
+def test_sim_edge_callbacks_follow_edge_direction():
+    gpio = SimGpioBackend()
+    gpio.setup(5, gpio.IN, pull_up_down=gpio.PUD_DOWN)
+    gpio.setup(6, gpio.IN, pull_up_down=gpio.PUD_UP)
+    rising, both = [], []
+    gpio.add_event_detect(5, gpio.RISING, callback=rising.append)
+    gpio.add_event_detect(6, gpio.BOTH, callback=both.append)
+    gpio.set_input(5, 1)
+    gpio.set_input(5, 0)
+    gpio.set_input(6, 0)
+    gpio.set_input(6, 0) # 값이 같으면 엣지 아님
+    gpio.set_input(6, 1)
+    assert rising == [5]
+    assert both == [6, 6]
+    assert gpio.input(6) == 1
+
+
+def test_sim_rejects_misconfigured_pins_like_rpi_gpio():
+    gpio = SimGpioBackend()
+    with pytest.raises(RuntimeError):
+        gpio.output(17, 1)
+    with pytest.raises(RuntimeError):
+        gpio.input(17)
+    gpio.setup(17, gpio.IN)
+    gpio.add_event_detect(17, gpio.BOTH)
+    with pytest.raises(RuntimeError):
+        gpio.add_event_detect(17, gpio.RISING)
+
+
+def test_get_gpio_selects_backend_by_name(monkeypatch):
+    monkeypatch.setattr(gpio_backend, "_gpio", None)
+    gpio = get_gpio("sim")
+    assert gpio.name == "sim"
+    assert get_gpio() is gpio # 프로세스당 1개
+    monkeypatch.setattr(gpio_backend, "_gpio", None)
+    with pytest.raises(ValueError):
+        get_gpio("bogus")
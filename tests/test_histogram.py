@@ -0,0 +1,29 @@
+from histogram import BounceHistogram, summarize
+
+
+# ==================== 히스토그램 (user-003) ====================
+
+def test_percentiles_use_bucket_upper_bounds():
+    histogram = BounceHistogram([1, 2, 5])
+    for ms in (0.5, 0.8, 1.5, 4.0):
+        histogram.add(ms / 1000)
+    assert histogram.percentile_ms(0.5) == 1
+    assert histogram.percentile_ms(0.99) == 5
+    assert histogram.as_dict() == {"<=1ms": 2, "<=2ms": 1, "<=5ms": 1, ">5ms": 0}
+
+
+def test_summarize_clamps_percentiles_to_max_and_rounds():
+    histogram = BounceHistogram([1, 2, 5])
+    histogram.add(0.0031234)
+    assert summarize(histogram) == {"p50": 3.123, "p99": 3.123, "max": 3.123}
+    histogram.add(0.0123456) # 마지막 구간 초과
+    assert summarize(histogram, digits=1) == {"p50": 5, "p99": 12.3, "max": 12.3}
+    assert summarize(BounceHistogram()) == {"p50": 0.0, "p99": 0.0, "max": 0.0}
+
+
+def test_merge_combines_counts_and_max():
+    first, second = BounceHistogram([1, 2]), BounceHistogram([1, 2])
+    first.add(0.0005)
+    second.add(0.003)
+    first.merge(second)
+    assert first.total == 2 and first.max_ms == 3.0
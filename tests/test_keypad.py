@@ -0,0 +1,253 @@
+import threading
+
+import pytest
+
+from gpio_backend import SimGpioBackend
+from keypad import (DEBOUNCE_INTEGRATOR, KEY_PRESS, KEY_RELEASE, POLICY_BUFFER, POLICY_DROP,
+                    POLICY_PREEMPT, POLL_ACTIVE, POLL_IDLE, AdaptivePollSchedule, FakeGpioRegisters,
+                    GpioMemBank, InterruptKeypad, KeyDebouncer, KeyInputThread, KeypadDebouncer, KeyQueue)
+
+KEYPAD_PB = [6, 12, 13, 16, 19, 20, 26, 21]
+
+
+class EdgeGpio:
+    """add_event_detect로 등록된 콜백만 기억하는 GPIO (edge()로 인터럽트를 손으로 발생)"""
+
+    BOTH = "both"
+
+    def __init__(self, failing_pin=None):
+        self.failing_pin = failing_pin
+        self.callbacks = {}
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        if pin == self.failing_pin:
+            raise RuntimeError("Failed to add edge detection")
+        self.callbacks[pin] = callback
+
+    def remove_event_detect(self, pin):
+        if self.callbacks.pop(pin, None) is None:
+            raise RuntimeError("edge detection not set up")
+
+    def edge(self, pin):
+        self.callbacks[pin](pin)
+
+
+def feed(debouncer, samples, start=0.0, interval=0.001):
+    """(레벨 목록)을 interval 간격으로 넣고 확정된 이벤트 목록 반환"""
+    events = []
+    for idx, level in enumerate(samples):
+        kind = debouncer.update(level, start + idx * interval)
+        if kind is not None:
+            events.append(kind)
+    return events
+
+
+def drain(queue):
+    keys = []
+    while True:
+        event = queue.get()
+        if event is None:
+            return keys
+        keys.append(event.key)
+
+
+# ==================== 인터럽트 키패드 (user-001) ====================
+
+def test_sim_edge_on_keypad_pin_wakes_input_thread_which_queues_the_key():
+    gpio = SimGpioBackend()
+    for pin in KEYPAD_PB:
+        gpio.setup(pin, gpio.IN, pull_up_down=gpio.PUD_DOWN)
+    queue = KeyQueue()
+    wake_event = threading.Event()
+    keypad = InterruptKeypad(gpio, KEYPAD_PB, wake_event)
+    keypad.start()
+    assert keypad.is_running and sorted(gpio.callbacks) == sorted(KEYPAD_PB)
+    gpio.set_input(13, 1) # GPIO13 = 키 "3"
+    assert wake_event.is_set()
+
+    key_ready = threading.Event()
+    queue.add_listener(key_ready.set)
+    thread = KeyInputThread(lambda: [gpio.input(pin) for pin in KEYPAD_PB],
+                            KeypadDebouncer(len(KEYPAD_PB), queue, stable_time=0.002),
+                            interval=1.0, wake_event=wake_event)
+    thread.start()
+    try:
+        assert key_ready.wait(1.0)
+        assert drain(queue) == ["3"]
+    finally:
+        thread.stop()
+        thread.join(1.0)
+    keypad.stop()
+    assert gpio.callbacks == {}
+
+
+def test_failed_registration_rolls_back_for_polling_fallback():
+    gpio = EdgeGpio(failing_pin=16)
+    keypad = InterruptKeypad(gpio, KEYPAD_PB, threading.Event())
+    with pytest.raises(RuntimeError):
+        keypad.start()
+    assert gpio.callbacks == {} and not keypad.is_running # 먼저 등록한 핀도 해제
+
+
+# ==================== 키 큐 (user-002) ====================
+
+def test_full_ring_buffer_drops_oldest_and_counts_overflow():
+    queue = KeyQueue(maxlen=3)
+    for key in "12345":
+        assert queue.push(key)
+    assert drain(queue) == ["3", "4", "5"]
+    stats = queue.stats()
+    assert stats["pushed"] == 5 and stats["dropped"] == 2
+    assert stats["drop_reasons"] == {"overflow": 2}
+
+
+def test_drop_state_discards_keys_with_state_reason():
+    queue = KeyQueue(policies={"unlock": POLICY_DROP})
+    queue.set_state("unlock")
+    assert queue.policy() == POLICY_DROP
+    assert not queue.push("1")
+    assert queue.get() is None
+    assert queue.stats()["drop_reasons"] == {"state:unlock": 1}
+
+
+def test_preempt_state_keeps_key_and_requests_stop():
+    queue = KeyQueue(policies={"cosmetic": POLICY_PREEMPT})
+    queue.push("1") # idle: 기본 정책(보관)
+    assert not queue.preempt_event.is_set()
+    queue.set_state("cosmetic")
+    queue.push("2")
+    assert queue.preempt_event.is_set()
+    queue.set_state("idle") # 상태가 바뀌면 중단 요청도 해제
+    assert not queue.preempt_event.is_set()
+    assert drain(queue) == ["1", "2"]
+
+
+def test_buffer_state_keeps_key_without_preempting():
+    queue = KeyQueue(policies={"special": POLICY_BUFFER}, default_policy=POLICY_DROP)
+    queue.set_state("special")
+    assert queue.push("7")
+    assert not queue.preempt_event.is_set()
+    assert drain(queue) == ["7"]
+
+
+def test_clear_records_dropped_count_under_reason():
+    queue = KeyQueue()
+    queue.push("1")
+    queue.push("2")
+    queue.clear("lockdown")
+    queue.clear("lockdown") # 비어 있으면 기록하지 않음
+    assert queue.get() is None
+    assert queue.stats()["drop_reasons"] == {"lockdown": 2}
+
+
+def test_listeners_are_notified_only_for_kept_keys():
+    queue = KeyQueue(policies={"fail": POLICY_DROP})
+    calls = []
+    listener = lambda: calls.append(queue.stats()["queued"])
+    queue.add_listener(listener)
+    queue.push("1")
+    queue.set_state("fail")
+    queue.push("2")
+    assert calls == [1] # 통지는 잠금 밖에서 (stats 호출 가능), 버린 키는 통지 없음
+    queue.remove_listener(listener)
+    queue.set_state("idle")
+    queue.push("3")
+    assert calls == [1]
+
+
+# ==================== 디바운스 (user-003) ====================
+
+def test_window_debouncer_ignores_chatter_and_reports_first_edge():
+    debouncer = KeyDebouncer(stable_time=0.005)
+    # 1ms 간격으로 떨리다가 눌림으로 안정
+    events = feed(debouncer, [1, 0, 1, 0, 1] + [1] * 10)
+    assert events == [KEY_PRESS]
+    assert debouncer.event_time == 0.0 # 떨림이 시작된 첫 엣지 시각
+    assert debouncer.histogram.total == 1
+    assert debouncer.histogram.max_ms == 4.0
+
+
+def test_window_debouncer_counts_glitch_without_event():
+    debouncer = KeyDebouncer(stable_time=0.005)
+    assert feed(debouncer, [1, 0] + [0] * 10) == []
+    assert debouncer.glitch_count == 1
+    assert debouncer.is_settled()
+
+
+def test_integrator_debouncer_needs_consecutive_samples():
+    debouncer = KeyDebouncer(stable_time=0.003, method=DEBOUNCE_INTEGRATOR)
+    assert feed(debouncer, [1, 1, 0, 1, 1, 1]) == [KEY_PRESS]
+    assert feed(debouncer, [0, 0, 0], start=1.0) == [KEY_RELEASE]
+
+
+def test_keypad_debouncer_pushes_presses_to_queue():
+    queue = KeyQueue()
+    releases = []
+    keypad = KeypadDebouncer(3, queue, stable_time=0.002, on_release=lambda key, ts: releases.append(key))
+    for step in range(5):
+        keypad.update([0, 1, 0], now=step * 0.001)
+    for step in range(5):
+        keypad.update([0, 0, 0], now=1.0 + step * 0.001)
+    event = queue.get()
+    assert event.key == "2" and event.timestamp == 0.0
+    assert releases == ["2"]
+    assert keypad.stats()["presses"] == 1
+
+
+# ==================== 적응형 샘플링 (user-004) ====================
+
+def test_adaptive_poll_bursts_on_activity_and_backs_off_after_timeout():
+    schedule = AdaptivePollSchedule(idle_interval=0.05, active_interval=0.002, idle_timeout=1.0)
+    assert schedule.next_interval(False, 0.0) == 0.05
+    assert schedule.next_interval(True, 0.1) == 0.002
+    assert schedule.mode == POLL_ACTIVE
+    assert schedule.next_interval(False, 0.9) == 0.002 # 아직 idle_timeout 전
+    assert schedule.next_interval(False, 1.1) == 0.05
+    assert schedule.mode == POLL_IDLE
+
+
+def test_adaptive_poll_records_worst_gap_per_mode():
+    schedule = AdaptivePollSchedule()
+    schedule.on_sample(0.0, 0.0)
+    schedule.on_sample(0.05, 0.001)
+    schedule.next_interval(True, 0.05)
+    schedule.on_sample(0.052, 0.0011)
+    stats = schedule.stats()
+    assert stats[POLL_IDLE]["worst_latency_ms"] == 50.0
+    assert stats[POLL_ACTIVE]["samples"] == 1
+
+
+# ==================== 레지스터 뱅크 읽기 (user-005) ====================
+
+def test_gpiomem_bank_reads_all_keys_from_one_register_word():
+    registers = FakeGpioRegisters()
+    bank = GpioMemBank([6, 12, 13], path=registers.path)
+    try:
+        registers.set_level(12, 1)
+        registers.set_level(3, 1) # 키패드가 아닌 핀은 무시
+        assert bank.read_levels() == [0, 1, 0]
+        assert bank.read_word() == (1 << 12) | (1 << 3)
+    finally:
+        bank.close()
+        registers.close()
+
+
+def test_gpiomem_bank_rejects_pins_outside_gplev0():
+    with pytest.raises(ValueError):
+        GpioMemBank([32])
+
+
+def test_sim_backend_mirrors_inputs_into_fake_registers():
+    gpio = SimGpioBackend()
+    gpio.setup(6, gpio.IN, pull_up_down=gpio.PUD_UP) # 붙이기 전 값도 옮겨 적음
+    gpio.setup(13, gpio.IN, pull_up_down=gpio.PUD_DOWN)
+    registers = gpio.attach_registers(FakeGpioRegisters())
+    bank = GpioMemBank([6, 13], path=registers.path)
+    seen = []
+    gpio.add_event_detect(13, gpio.RISING, callback=lambda pin: seen.append(bank.read_levels()))
+    try:
+        gpio.set_input(13, 1)
+        assert seen == [[1, 1]] # 콜백 시점에 레지스터가 이미 바뀌어 있음
+    finally:
+        bank.close()
+        registers.close()
@@ -0,0 +1,85 @@
+import asyncio
+
+from clock import WarpClock
+from scheduler import COMPACT_MIN_CANCELLED, TimerScheduler
+
+
+# ==================== 타이머 스케줄러 (user-010) ====================
+
+def test_timers_fire_in_deadline_then_registration_order(manual_clock):
+    scheduler = TimerScheduler(manual_clock)
+    fired = []
+    scheduler.call_later(2.0, fired.append, "late")
+    scheduler.call_later(1.0, fired.append, "first")
+    scheduler.call_later(1.0, fired.append, "second")
+    manual_clock.advance(1.0)
+    scheduler._fire_due()
+    assert fired == ["first", "second"]
+    manual_clock.advance(1.5)
+    scheduler._fire_due()
+    assert fired == ["first", "second", "late"]
+    assert scheduler.stats()["lateness_ms"]["timer"]["count"] == 3
+
+
+def test_cancelled_timer_is_skipped_and_heap_is_compacted(manual_clock):
+    scheduler = TimerScheduler(manual_clock)
+    fired = []
+    keep = scheduler.call_later(1.0, fired.append, "keep")
+    timers = [scheduler.call_later(0.5, fired.append, "cancelled") for _ in range(COMPACT_MIN_CANCELLED)]
+    for timer in timers:
+        timer.cancel()
+    timers[0].cancel() # 두 번 취소해도 한 번만 셈
+    assert scheduler.pending() == 1
+    assert len(scheduler._heap) == 1 # 취소된 항목이 절반을 넘어 힙 재구성
+    manual_clock.advance(1.0)
+    scheduler._fire_due()
+    assert fired == ["keep"] and keep.done
+    assert scheduler.stats()["cancelled"] == COMPACT_MIN_CANCELLED
+
+
+def test_rescheduling_moves_a_timer_later(manual_clock):
+    # 연장 = 취소 후 더 늦은 만료 시각으로 다시 등록
+    scheduler = TimerScheduler(manual_clock)
+    fired = []
+    timer = scheduler.call_later(1.0, fired.append, "relock")
+    timer.cancel()
+    scheduler.call_later(3.0, fired.append, "relock")
+    manual_clock.advance(2.0)
+    scheduler._fire_due()
+    assert fired == []
+    manual_clock.advance(1.0)
+    scheduler._fire_due()
+    assert fired == ["relock"]
+
+
+def test_ticker_deadlines_do_not_accumulate_drift():
+    clock = WarpClock(100, start_time=0.0)
+    scheduler = TimerScheduler(clock)
+
+    async def main():
+        runner = asyncio.create_task(scheduler.run())
+        ticker = scheduler.ticker("blink")
+        try:
+            for _ in range(5):
+                await ticker.wait(0.1)
+        finally:
+            runner.cancel()
+            await asyncio.wait([runner])
+        return ticker, clock.monotonic() - ticker.start
+
+    ticker, actual = asyncio.run(main())
+    assert abs(ticker.elapsed() - 0.5) < 1e-9 # 만료 시각은 정확히 간격의 합
+    assert actual >= 0.5
+
+
+def test_wall_clock_jump_does_not_move_deadlines(manual_clock):
+    # 벽시계(time())가 NTP 보정 등으로 앞으로 뛰어도 단조 시계 기준 만료 시각은 그대로
+    scheduler = TimerScheduler(manual_clock)
+    fired = []
+    scheduler.call_later(1.0, fired.append, "relock")
+    manual_clock.time = lambda: manual_clock.now + 3600
+    scheduler._fire_due()
+    assert fired == []
+    manual_clock.advance(1.0)
+    scheduler._fire_due()
+    assert fired == ["relock"]